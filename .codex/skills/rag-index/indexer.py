@@ -134,6 +134,14 @@ def _read_file_text(path: str) -> str | None:
         return None
 
 
+def _load_manifest(manifest_path: str) -> list[dict[str, Any]]:
+    """Load a scanner manifest: a JSON array, or NDJSON from ``scanner.py --ndjson``."""
+    text = Path(manifest_path).read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
 def build_index(
     manifest_path: str,
     output_path: str,
@@ -148,9 +156,7 @@ def build_index(
 
     Returns stats dict with chunk-level counts.
     """
-    manifest: list[dict[str, Any]] = json.loads(
-        Path(manifest_path).read_text(encoding="utf-8")
-    )
+    manifest = _load_manifest(manifest_path)
 
     conn = sqlite3.connect(output_path)
     conn.execute("PRAGMA journal_mode=WAL")
@@ -8,14 +8,21 @@ and outputs a file manifest with metadata (path, size, mtime, type).
 from __future__ import annotations
 
 import argparse
+import fnmatch as _fnmatch
+import functools
 import hashlib
 import json
 import mimetypes
+import mmap
 import os
+import posixpath
+import re
 import sys
-from fnmatch import fnmatch
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator, Literal
 
 
 # Common extension -> language mapping (~20 common extensions)
@@ -66,9 +73,15 @@ _EXTENSION_TO_LANGUAGE: dict[str, str] = {
 }
 
 
-def _infer_language(path: Path) -> str | None:
+def _suffix(name: str) -> str:
+    """Same result as ``Path(name).suffix`` for a bare file name, without a Path."""
+    i = name.rfind(".")
+    return name[i:] if 0 < i < len(name) - 1 else ""
+
+
+def _infer_language(path: Path | str) -> str | None:
     """Infer language from file extension. Returns None if unknown."""
-    ext = path.suffix.lower()
+    ext = _suffix(os.path.basename(path)).lower()
     return _EXTENSION_TO_LANGUAGE.get(ext)
 
 
@@ -85,59 +98,276 @@ def _parse_gitignore(gitignore_path: Path) -> list[str]:
     return patterns
 
 
-def _collect_gitignore_patterns(directory: Path) -> list[str]:
+_PatternKind = Literal["gitignore", "exclude"]
+_TaggedPattern = tuple[_PatternKind, str]
+
+
+def _collect_gitignore_patterns(directory: Path) -> list[_TaggedPattern]:
     """Collect gitignore patterns from .gitignore and .ignore in a directory."""
-    patterns: list[str] = []
-    for name in (".gitignore", ".ignore"):
-        patterns.extend(_parse_gitignore(directory / name))
+    patterns: list[_TaggedPattern] = []
+    for name in _IGNORE_FILE_NAMES:
+        patterns.extend(("gitignore", pat) for pat in _parse_gitignore(directory / name))
     return patterns
 
 
-def _matches_any(rel_path: str, patterns: list[str]) -> str | None:
-    """Return the first matching pattern if rel_path matches any, else None.
+_IGNORE_FILE_NAMES = (".gitignore", ".ignore")
+
+
+def _has_ignore_file(filenames: list[str]) -> bool:
+    """Whether a directory listing from ``_walk`` contains an ignore file."""
+    return any(name in filenames for name in _IGNORE_FILE_NAMES)
+
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+@dataclass(frozen=True)
+class _RuleGroup:
+    """A run of same-kind ignore patterns: literal lookups plus one glob regex."""
+
+    kind: _PatternKind
+    literals: frozenset[str]
+    glob_re: re.Pattern[str] | None
+
+    def matches(self, target: str) -> bool:
+        if target in self.literals:
+            return True
+        return self.glob_re is not None and self.glob_re.match(target) is not None
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_rules(patterns: tuple[_TaggedPattern, ...]) -> tuple[_RuleGroup, ...]:
+    """Compile ignore patterns once; cached per distinct pattern tuple.
+
+    Consecutive patterns of the same kind share one ``_RuleGroup``. Groups
+    keep the original order, so the first group with any hit is the kind of
+    the first matching pattern.
+    """
+    runs: list[tuple[_PatternKind, list[str]]] = []
+    for kind, pat in patterns:
+        if not runs or runs[-1][0] != kind:
+            runs.append((kind, []))
+        runs[-1][1].append(os.path.normcase(pat.lstrip("/").rstrip("/")))
+
+    groups: list[_RuleGroup] = []
+    for kind, checks in runs:
+        literals = frozenset(c for c in checks if _GLOB_CHARS.isdisjoint(c))
+        globs = [_fnmatch.translate(c) for c in checks if not _GLOB_CHARS.isdisjoint(c)]
+        glob_re = re.compile("|".join(globs)) if globs else None
+        groups.append(_RuleGroup(kind=kind, literals=literals, glob_re=glob_re))
+    return tuple(groups)
+
+
+def _matches_any(
+    rel_path: str,
+    patterns: list[_TaggedPattern] | tuple[_TaggedPattern, ...],
+) -> _PatternKind | None:
+    """Return the kind of the first matching pattern, else None.
 
     Supports simple gitignore-style matching:
     - Patterns ending with '/' match directories only (checked by caller)
     - Leading '/' anchors to the root
     - Otherwise matched against any path component or the full relative path
+
+    Literal patterns are resolved with hash lookups and glob patterns with a
+    single compiled alternation. Matching stops at the first hit, trying the
+    basename (where most patterns hit) before the full path and the parent
+    components.
+    """
+    if not patterns:
+        return None
+    return _match_rules(rel_path, _compile_rules(tuple(patterns)))
+
+
+def _match_rules(rel_path: str, rules: tuple[_RuleGroup, ...]) -> _PatternKind | None:
+    """Same as ``_matches_any`` but against rules already built by ``_compile_rules``.
+
+    The scanner compiles the rules once per directory and calls this for every
+    entry, so the pattern tuple is neither rebuilt nor re-hashed per path.
     """
-    name = os.path.basename(rel_path)
-    for pat in patterns:
-        anchor = pat.startswith("/")
-        check = pat.lstrip("/").rstrip("/")
-        # Match against basename
-        if fnmatch(name, check):
-            return pat
-        # Match against full relative path
-        if fnmatch(rel_path, check):
-            return pat
-        if anchor and fnmatch(rel_path, check):
-            return pat
-        # Match directory components
-        for part in Path(rel_path).parts:
-            if fnmatch(part, check):
-                return pat
+    if not rules:
+        return None
+    normalized = os.path.normcase(rel_path)
+    parts = normalized.split(os.sep)
+    name = parts[-1]
+    for group in rules:
+        if group.matches(name) or group.matches(normalized):
+            return group.kind
+        for part in parts[:-1]:
+            if group.matches(part):
+                return group.kind
     return None
 
 
-def _guess_type(path: Path) -> str:
-    """Guess MIME type for a file path."""
-    mime, _ = mimetypes.guess_type(str(path))
+def _guess_type(path: Path | str) -> str:
+    """Guess MIME type for a file path.
+
+    ``mimetypes.guess_type`` only looks at the final extension unless it is a
+    compression or alias suffix (``.gz``, ``.tgz``, ...), so everything else is
+    answered from a per-extension cache.
+    """
+    path = str(path)
+    ext = posixpath.splitext(path)[1]
+    if (
+        ext.lower() in mimetypes.suffix_map
+        or ext in mimetypes.encodings_map
+        or path[:5].lower() == "data:"
+    ):
+        mime, _ = mimetypes.guess_type(path)
+        return mime or "application/octet-stream"
+    return _guess_type_for_ext(ext)
+
+
+@functools.lru_cache(maxsize=1024)
+def _guess_type_for_ext(ext: str) -> str:
+    mime, _ = mimetypes.guess_type(f"x{ext}")
     return mime or "application/octet-stream"
 
 
-def _compute_content_hash(path: Path) -> str:
-    """Compute SHA-256 hash of file content."""
-    h = hashlib.sha256()
+_HASH_READ_SIZE = 1 << 20
+_HASH_MMAP_THRESHOLD = 8 << 20
+
+
+_DIR_FD_SUPPORTED = (
+    hasattr(os, "O_DIRECTORY")
+    and os.open in os.supports_dir_fd
+    and os.stat in os.supports_dir_fd
+)
+
+
+def _open_dir_fd(dirpath: str) -> int | None:
+    """Open a directory for ``dir_fd``-relative lookups, or None if unavailable."""
     try:
-        with path.open("rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                h.update(chunk)
+        return os.open(dirpath, os.O_RDONLY | os.O_DIRECTORY)
     except OSError:
+        return None
+
+
+def _compute_content_hash(path: str | Path, *, dir_fd: int | None = None) -> str:
+    """Compute SHA-256 hash of file content.
+
+    Large files are hashed through a read-only mmap; smaller ones are read
+    with ``readinto`` into a single buffer reused for every chunk. When
+    ``dir_fd`` is given, ``path`` is resolved relative to that directory.
+    """
+    h = hashlib.sha256()
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0), dir_fd=dir_fd)
+        with open(fd, "rb", buffering=0) as f:
+            fd = f.fileno()
+            size = os.fstat(fd).st_size
+            if hasattr(os, "posix_fadvise"):
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                except OSError:
+                    pass
+            if size >= _HASH_MMAP_THRESHOLD:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+                    h.update(mapped)
+            else:
+                # A reported size of 0 may just mean "unknown" (pipes, procfs);
+                # don't end up reading those one byte at a time.
+                buf = bytearray(min(_HASH_READ_SIZE, size + 1) if size else _HASH_READ_SIZE)
+                view = memoryview(buf)
+                while True:
+                    n = f.readinto(buf)
+                    if not n:
+                        break
+                    h.update(view[:n])
+    except (OSError, ValueError):
         return ""
     return h.hexdigest()
 
 
+# stat/open/read release the GIL, so a few directories are described in
+# parallel while the main thread keeps walking and filtering.
+_DESCRIBE_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+
+
+def _describe_files(
+    dirpath: str,
+    root: str,
+    selected: list[tuple[str, str]],
+) -> list[dict[str, Any]]:
+    """Build manifest entries for the ``(fname, rel_path)`` pairs kept in ``dirpath``.
+
+    Runs on a worker thread. Files that vanish or cannot be stat'ed are
+    dropped, as in a sequential scan.
+    """
+    entries: list[dict[str, Any]] = []
+    # Resolve stat/open relative to the already-open parent directory
+    # instead of walking the full path each time.
+    dir_fd = _open_dir_fd(dirpath) if _DIR_FD_SUPPORTED else None
+    try:
+        for fname, rel in selected:
+            fpath = os.path.join(dirpath, fname)
+            target = fname if dir_fd is not None else fpath
+            try:
+                stat_info = os.stat(target, dir_fd=dir_fd)
+            except OSError:
+                continue
+
+            content_hash = _compute_content_hash(target, dir_fd=dir_fd)
+            language = _EXTENSION_TO_LANGUAGE.get(_suffix(fname).lower())
+
+            entries.append({
+                "path": fpath,
+                "rel_path": rel,
+                "root": root,
+                "size": stat_info.st_size,
+                "mtime": stat_info.st_mtime,
+                "type": _guess_type(fpath),
+                "content_hash": content_hash,
+                "language": language,
+            })
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+    return entries
+
+
+def _walk(root: str) -> Iterator[tuple[str, str, int, list[str], list[str]]]:
+    """Walk ``root`` top-down, yielding ``(dirpath, rel_dir, depth, dirnames, filenames)``.
+
+    Mirrors ``os.walk(root)``: callers may prune ``dirnames`` in place,
+    symlinked directories are listed but not descended into, and unreadable
+    directories are skipped. The root-relative path is carried along as a
+    plain string so no ``Path`` objects are built per directory.
+    """
+    stack: list[tuple[str, str, int]] = [(root, "", 0)]
+    while stack:
+        dirpath, rel_dir, depth = stack.pop()
+        dirnames: list[str] = []
+        filenames: list[str] = []
+        symlinked: set[str] = set()
+        try:
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        filenames.append(entry.name)
+                        continue
+                    dirnames.append(entry.name)
+                    try:
+                        if entry.is_symlink():
+                            symlinked.add(entry.name)
+                    except OSError:
+                        pass
+        except OSError:
+            continue
+
+        yield dirpath, rel_dir, depth, dirnames, filenames
+
+        for name in reversed(dirnames):
+            if name in symlinked:
+                continue
+            child_rel = f"{rel_dir}{os.sep}{name}" if rel_dir else name
+            stack.append((os.path.join(dirpath, name), child_rel, depth + 1))
+
+
 class ScanStats:
     """Track exclusion statistics during scanning."""
 
@@ -168,7 +398,7 @@ class ScanStats:
         return f"Included: {self.total_included}, Excluded: {excluded_total} ({', '.join(parts) if parts else 'none'})"
 
 
-def scan_directories(
+def iter_scan(
     directories: list[str],
     *,
     include_patterns: list[str] | None = None,
@@ -177,8 +407,13 @@ def scan_directories(
     max_depth: int | None = None,
     respect_gitignore: bool = True,
     stats: ScanStats | None = None,
-) -> list[dict[str, Any]]:
-    """Scan multiple directories and return a file manifest.
+    sort_entries: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """Scan multiple directories, yielding file metadata dicts as they are ready.
+
+    Entries come out in walk order (directories depth-first, in directory
+    listing order unless ``sort_entries``), not in ``scan_directories``'
+    ``(root, rel_path)`` order.
 
     Args:
         directories: List of directory paths to scan.
@@ -188,108 +423,156 @@ def scan_directories(
         max_depth: Maximum directory depth to recurse (0 = root only).
         respect_gitignore: Whether to respect .gitignore / .ignore files.
         stats: Optional ScanStats object to track exclusion reasons.
+        sort_entries: Visit subdirectories and files of each directory in name order.
 
-    Returns:
-        List of file metadata dicts, sorted by (root, rel_path) for determinism.
+    Yields:
+        File metadata dicts (path, rel_path, root, size, mtime, type,
+        content_hash, language).
     """
-    manifest: list[dict[str, Any]] = []
-    exclude_patterns = list(exclude_patterns or [])
-    gitignore_patterns_set: set[str] = set()  # Track which patterns are from gitignore
-
-    for dir_path_str in directories:
-        root = Path(dir_path_str).resolve()
-        if not root.is_dir():
-            print(f"WARNING: {root} is not a directory, skipping.", file=sys.stderr)
-            continue
-
-        # Gather gitignore patterns from root
-        gitignore_patterns: list[str] = []
-        if respect_gitignore:
-            gitignore_patterns = _collect_gitignore_patterns(root)
-            gitignore_patterns_set.update(gitignore_patterns)
-
-        for dirpath, dirnames, filenames in os.walk(root):
-            current = Path(dirpath)
-            depth = len(current.relative_to(root).parts)
+    pending: deque[Future[list[dict[str, Any]]]] = deque()
+    tagged_excludes: list[_TaggedPattern] = [
+        ("exclude", pat) for pat in exclude_patterns or []
+    ]
+    # Same matching as fnmatch(fname, p) for any p, compiled once.
+    include_re = (
+        re.compile("|".join(_fnmatch.translate(os.path.normcase(p)) for p in include_patterns))
+        if include_patterns
+        else None
+    )
+    file_type_set = frozenset(file_types or ())
 
-            if max_depth is not None and depth > max_depth:
-                dirnames.clear()
+    with ThreadPoolExecutor(max_workers=_DESCRIBE_WORKERS) as pool:
+        for dir_path_str in directories:
+            root = Path(dir_path_str).resolve()
+            if not root.is_dir():
+                print(f"WARNING: {root} is not a directory, skipping.", file=sys.stderr)
                 continue
 
-            # Per-directory gitignore
-            local_patterns: list[str] = []
-            if respect_gitignore and current != root:
-                local_patterns = _collect_gitignore_patterns(current)
-                gitignore_patterns_set.update(local_patterns)
-
-            all_ignore = gitignore_patterns + local_patterns + exclude_patterns
-
-            # Filter directories in-place so os.walk skips them
-            filtered_dirs: list[str] = []
-            for d in dirnames:
-                rel = str(Path(dirpath, d).relative_to(root))
-                if d.startswith("."):
-                    if stats:
-                        stats.by_hidden += 1
-                    continue
-                matched = _matches_any(rel, all_ignore)
-                if matched:
-                    if stats:
-                        if matched in gitignore_patterns_set:
-                            stats.by_gitignore += 1
-                        else:
-                            stats.by_exclude += 1
-                    continue
-                filtered_dirs.append(d)
-            dirnames[:] = sorted(filtered_dirs)
-
-            for fname in sorted(filenames):
-                fpath = Path(dirpath) / fname
-                rel = str(fpath.relative_to(root))
-
-                # Gitignore / exclude check
-                matched_pattern = _matches_any(rel, all_ignore)
-                if matched_pattern:
-                    if stats:
-                        if matched_pattern in gitignore_patterns_set:
-                            stats.by_gitignore += 1
-                        else:
-                            stats.by_exclude += 1
+            # Gather gitignore patterns from root
+            gitignore_patterns: list[_TaggedPattern] = []
+            if respect_gitignore:
+                gitignore_patterns = _collect_gitignore_patterns(root)
+            root_rules = _compile_rules(tuple(gitignore_patterns + tagged_excludes))
+
+            root_str = str(root)
+            for dirpath, rel_dir, depth, dirnames, filenames in _walk(root_str):
+                if max_depth is not None and depth > max_depth:
+                    dirnames.clear()
                     continue
 
-                # Include pattern filter
-                if include_patterns:
-                    if not any(fnmatch(fname, p) for p in include_patterns):
+                # Per-directory gitignore. The listing from _walk already tells
+                # us whether an ignore file is present, so directories without
+                # one cost no extra syscalls and reuse the root rules.
+                rules = root_rules
+                if respect_gitignore and depth > 0 and _has_ignore_file(filenames):
+                    local_patterns = _collect_gitignore_patterns(Path(dirpath))
+                    if local_patterns:
+                        rules = _compile_rules(
+                            tuple(gitignore_patterns + local_patterns + tagged_excludes)
+                        )
+
+                # Filter directories in-place so _walk skips them
+                filtered_dirs: list[str] = []
+                for d in dirnames:
+                    rel = f"{rel_dir}{os.sep}{d}" if rel_dir else d
+                    if d.startswith("."):
+                        if stats:
+                            stats.by_hidden += 1
+                        continue
+                    kind = _match_rules(rel, rules)
+                    if kind:
                         if stats:
-                            stats.by_include += 1
+                            if kind == "gitignore":
+                                stats.by_gitignore += 1
+                            else:
+                                stats.by_exclude += 1
+                        continue
+                    filtered_dirs.append(d)
+                if max_depth is not None and depth >= max_depth:
+                    # Children would exceed the limit; skip listing them at all.
+                    filtered_dirs.clear()
+                dirnames[:] = sorted(filtered_dirs) if sort_entries else filtered_dirs
+
+                selected: list[tuple[str, str]] = []
+                for fname in sorted(filenames) if sort_entries else filenames:
+                    rel = f"{rel_dir}{os.sep}{fname}" if rel_dir else fname
+
+                    # Include pattern and file type filters are one regex match
+                    # and one set lookup on the name, so they run before the
+                    # ignore rules. When stats are collected the ignore rules
+                    # still get the first say, so each file is counted under
+                    # the same reason as before.
+                    excluded_by: str | None = None
+                    if include_re is not None and include_re.match(os.path.normcase(fname)) is None:
+                        excluded_by = "include"
+                    elif file_type_set and _suffix(fname).lower() not in file_type_set:
+                        excluded_by = "file_types"
+                    if excluded_by is not None and stats is None:
                         continue
 
-                # File type filter
-                if file_types:
-                    ext = fpath.suffix.lower()
-                    if ext not in file_types:
+                    # Gitignore / exclude check
+                    kind = _match_rules(rel, rules)
+                    if kind:
                         if stats:
-                            stats.by_file_types += 1
+                            if kind == "gitignore":
+                                stats.by_gitignore += 1
+                            else:
+                                stats.by_exclude += 1
                         continue
 
-                try:
-                    stat_info = fpath.stat()
-                except OSError:
-                    continue
+                    if excluded_by is not None:
+                        if stats:
+                            if excluded_by == "include":
+                                stats.by_include += 1
+                            else:
+                                stats.by_file_types += 1
+                        continue
 
-                content_hash = _compute_content_hash(fpath)
-                language = _infer_language(fpath)
+                    selected.append((fname, rel))
 
-                manifest.append({
-                    "path": str(fpath),
-                    "rel_path": rel,
-                    "root": str(root),
-                    "size": stat_info.st_size,
-                    "mtime": stat_info.st_mtime,
-                    "type": _guess_type(fpath),
-                    "content_hash": content_hash,
-                    "language": language,
-                })
+                if selected:
+                    pending.append(pool.submit(_describe_files, dirpath, root_str, selected))
+                # Hand back finished directories while the walk goes on.
+                while pending and pending[0].done():
+                    for entry in pending.popleft().result():
+                        if stats:
+                            stats.total_included += 1
+                        yield entry
+
+        while pending:
+            for entry in pending.popleft().result():
+                if stats:
+                    stats.total_included += 1
+                yield entry
+
+
+def scan_directories(
+    directories: list[str],
+    *,
+    include_patterns: list[str] | None = None,
+    exclude_patterns: list[str] | None = None,
+    file_types: list[str] | None = None,
+    max_depth: int | None = None,
+    respect_gitignore: bool = True,
+    stats: ScanStats | None = None,
+) -> list[dict[str, Any]]:
+    """Scan multiple directories and return a file manifest.
+
+    Takes the same arguments as ``iter_scan``. The manifest is sorted once at
+    the end, so directories are walked without per-directory sorting.
+
+    Returns:
+        List of file metadata dicts, sorted by (root, rel_path) for determinism.
+    """
+    manifest = list(iter_scan(
+        directories,
+        include_patterns=include_patterns,
+        exclude_patterns=exclude_patterns,
+        file_types=file_types,
+        max_depth=max_depth,
+        respect_gitignore=respect_gitignore,
+        stats=stats,
+    ))
 
     # Sort by (root, rel_path) for deterministic output
     manifest.sort(key=lambda e: (e["root"], e["rel_path"]))
@@ -343,6 +626,12 @@ def main(argv: list[str] | None = None) -> None:
         action="store_true",
         help="Ignore .gitignore and .ignore files.",
     )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Write one compact JSON object per line as files are scanned "
+             "(walk order, not sorted).",
+    )
     parser.add_argument(
         "--stats",
         action="store_true",
@@ -358,8 +647,7 @@ def main(argv: list[str] | None = None) -> None:
 
     scan_stats = ScanStats() if args.stats else None
 
-    manifest = scan_directories(
-        args.directories,
+    scan_kwargs: dict[str, Any] = dict(
         include_patterns=args.include,
         exclude_patterns=args.exclude,
         file_types=file_types,
@@ -368,12 +656,34 @@ def main(argv: list[str] | None = None) -> None:
         stats=scan_stats,
     )
 
-    output = json.dumps(manifest, indent=2)
+    if args.ndjson:
+        handle = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        count = 0
+        try:
+            for entry in iter_scan(args.directories, **scan_kwargs):
+                handle.write(json.dumps(entry, separators=(",", ":")))
+                handle.write("\n")
+                count += 1
+        finally:
+            if handle is not sys.stdout:
+                handle.close()
+        if args.output:
+            print(f"Wrote {count} entries to {args.output}")
+        if scan_stats:
+            print(scan_stats.summary(), file=sys.stderr)
+        return
+
+    manifest = scan_directories(args.directories, **scan_kwargs)
+
+    # Serialize straight into the destination stream rather than building the
+    # whole indented document as one string first.
     if args.output:
-        Path(args.output).write_text(output, encoding="utf-8")
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, indent=2)
         print(f"Wrote {len(manifest)} entries to {args.output}")
     else:
-        print(output)
+        json.dump(manifest, sys.stdout, indent=2)
+        sys.stdout.write("\n")
 
     if scan_stats:
         print(scan_stats.summary(), file=sys.stderr)
@@ -3,10 +3,14 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import math
+import os
 import re
 import sqlite3
+import sys
+from array import array
 from collections import Counter
 from typing import Any
 
@@ -124,7 +128,54 @@ def _build_tfidf_vectors(
     return (vocab_terms, idf, vectors)
 
 
-def _load_model(conn: sqlite3.Connection) -> tuple[list[str], list[float]]:
+def _encode_model(vocab: list[str], idf: list[float]) -> tuple[bytes, bytes]:
+    """Pack vocab as NUL-separated UTF-8 and IDF as little-endian float64."""
+    idf_arr = array("d", idf)
+    if sys.byteorder != "little":
+        idf_arr.byteswap()
+    vocab_blob = b"\0".join(term.encode("utf-8") for term in vocab)
+    return (vocab_blob, idf_arr.tobytes())
+
+
+def _decode_model(vocab_blob: bytes, idf_blob: bytes) -> tuple[list[str], list[float]]:
+    if len(idf_blob) % 8:
+        raise ValueError("stored vectorizer metadata is invalid; rebuild with --vectors")
+    idf_arr = array("d")
+    idf_arr.frombytes(idf_blob)
+    if sys.byteorder != "little":
+        idf_arr.byteswap()
+    vocab = vocab_blob.decode("utf-8").split("\0") if vocab_blob else []
+    return (vocab, idf_arr.tolist())
+
+
+def _load_model(
+    conn: sqlite3.Connection,
+) -> tuple[tuple[str, ...], tuple[float, ...], dict[str, int]]:
+    vocab_row = conn.execute(
+        "SELECT value FROM meta WHERE key = 'vectorizer_vocab_blob'"
+    ).fetchone()
+    idf_row = conn.execute(
+        "SELECT value FROM meta WHERE key = 'vectorizer_idf_blob'"
+    ).fetchone()
+    if vocab_row is not None and idf_row is not None:
+        try:
+            vocab, idf = _decode_model(bytes(vocab_row[0]), bytes(idf_row[0]))
+        except (TypeError, UnicodeDecodeError) as exc:
+            raise ValueError("stored vectorizer metadata is invalid; rebuild with --vectors") from exc
+    else:
+        vocab, idf = _load_legacy_model(conn)
+
+    if len(vocab) != len(idf):
+        raise ValueError("stored vectorizer metadata is inconsistent; rebuild with --vectors")
+
+    vocab_terms = tuple(vocab)
+    idf_values = tuple(idf)
+    vocab_index = {term: idx for idx, term in enumerate(vocab_terms)}
+    return (vocab_terms, idf_values, vocab_index)
+
+
+def _load_legacy_model(conn: sqlite3.Connection) -> tuple[list[str], list[float]]:
+    """Read the JSON-encoded model written by older index builds."""
     vocab_row = conn.execute(
         "SELECT value FROM meta WHERE key = 'vectorizer_vocab'"
     ).fetchone()
@@ -142,16 +193,41 @@ def _load_model(conn: sqlite3.Connection) -> tuple[list[str], list[float]]:
 
     if not isinstance(vocab, list) or not isinstance(idf, list):
         raise ValueError("stored vectorizer metadata is invalid; rebuild with --vectors")
-    if len(vocab) != len(idf):
-        raise ValueError("stored vectorizer metadata is inconsistent; rebuild with --vectors")
+    return ([str(term) for term in vocab], [float(value) for value in idf])
 
-    vocab_terms = [str(term) for term in vocab]
-    idf_values = [float(value) for value in idf]
-    return (vocab_terms, idf_values)
 
+def _index_signature(index_path: str) -> tuple[int, ...]:
+    """Return a cheap change signature for an index DB (including its WAL)."""
+    signature: list[int] = []
+    for candidate in (index_path, f"{index_path}-wal"):
+        try:
+            st = os.stat(candidate)
+        except OSError:
+            signature.extend((0, 0))
+            continue
+        signature.extend((st.st_mtime_ns, st.st_size))
+    return tuple(signature)
 
-def _build_query_vector(query: str, vocab_terms: list[str], idf: list[float]) -> dict[int, float]:
-    vocab_index = {term: idx for idx, term in enumerate(vocab_terms)}
+
+@functools.lru_cache(maxsize=8)
+def _load_model_cached(
+    index_path: str,
+    signature: tuple[int, ...],
+) -> tuple[tuple[str, ...], tuple[float, ...], dict[str, int]]:
+    """Load the vectorizer model once per (index, on-disk signature)."""
+    del signature  # cache key only
+    conn = sqlite3.connect(index_path)
+    try:
+        return _load_model(conn)
+    finally:
+        conn.close()
+
+
+def _build_query_vector(
+    query: str,
+    vocab_index: dict[str, int],
+    idf: tuple[float, ...] | list[float],
+) -> dict[int, float]:
     counts = Counter(_tokenize(query))
     vec: dict[int, float] = {}
     norm_sq = 0.0
@@ -176,6 +252,38 @@ def _dot(a: dict[int, float], b: dict[int, float]) -> float:
     return sum(weight * b.get(idx, 0.0) for idx, weight in a.items())
 
 
+def _query_probes(query_vec: dict[int, float]) -> list[tuple[str, float]]:
+    """Return ``('"idx":', weight)`` probes matching ``_serialize_vector`` keys."""
+    return [(f'"{idx}":', weight) for idx, weight in query_vec.items()]
+
+
+def _dot_serialized(
+    raw: str,
+    probes: list[tuple[str, float]],
+    query_vec: dict[int, float],
+) -> float:
+    """Score a stored vector against the query without deserializing it.
+
+    Each query term is located with a substring probe on the compact JSON
+    produced by ``_serialize_vector``; only the matched weights are parsed.
+    Rows that do not look like that format fall back to a full decode.
+    """
+    score = 0.0
+    for probe, weight in probes:
+        pos = raw.find(probe)
+        if pos == -1:
+            continue
+        start = pos + len(probe)
+        end = raw.find(",", start)
+        if end == -1:
+            end = raw.find("}", start)
+        try:
+            score += weight * float(raw[start:end])
+        except ValueError:
+            return _dot(query_vec, _deserialize_vector(raw))
+    return score
+
+
 def rebuild_vectors(
     conn: sqlite3.Connection,
     *,
@@ -201,13 +309,15 @@ def rebuild_vectors(
             payload,
         )
 
+    vocab_blob, idf_blob = _encode_model(vocab, idf)
+    conn.execute("DELETE FROM meta WHERE key IN ('vectorizer_vocab', 'vectorizer_idf')")
     conn.execute(
         "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
-        ("vectorizer_vocab", json.dumps(vocab, separators=(",", ":"))),
+        ("vectorizer_vocab_blob", vocab_blob),
     )
     conn.execute(
         "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
-        ("vectorizer_idf", json.dumps(idf, separators=(",", ":"))),
+        ("vectorizer_idf_blob", idf_blob),
     )
     conn.execute(
         "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
@@ -224,6 +334,8 @@ def clear_vectors(conn: sqlite3.Connection) -> None:
     conn.execute("DELETE FROM vectors")
     conn.execute("DELETE FROM meta WHERE key = 'vectorizer_vocab'")
     conn.execute("DELETE FROM meta WHERE key = 'vectorizer_idf'")
+    conn.execute("DELETE FROM meta WHERE key = 'vectorizer_vocab_blob'")
+    conn.execute("DELETE FROM meta WHERE key = 'vectorizer_idf_blob'")
     conn.execute("DELETE FROM meta WHERE key = 'vectorizer_chunk_count'")
 
 
@@ -237,19 +349,17 @@ def semantic_search(
     if top_k < 1:
         raise ValueError("--top-k must be >= 1")
 
+    _, idf, vocab_index = _load_model_cached(index_path, _index_signature(index_path))
+    query_vec = _build_query_vector(query, vocab_index, idf)
+    if not query_vec:
+        return []
+
     conn = sqlite3.connect(index_path)
     try:
-        vocab, idf = _load_model(conn)
-        query_vec = _build_query_vector(query, vocab, idf)
-        if not query_vec:
-            return []
-
+        probes = _query_probes(query_vec)
         scores: list[tuple[str, float]] = []
         for chunk_id, raw_vector in conn.execute("SELECT chunk_id, vector FROM vectors"):
-            vec = _deserialize_vector(str(raw_vector))
-            if not vec:
-                continue
-            score = _dot(query_vec, vec)
+            score = _dot_serialized(str(raw_vector), probes, query_vec)
             if score > 0.0:
                 scores.append((str(chunk_id), score))
 
@@ -3492,7 +3492,7 @@ def cmd_status(args: argparse.Namespace) -> int:
     return 0
 
 
-def cmd_next(args: argparse.Namespace) -> int:
+def _next_payload(args: argparse.Namespace) -> tuple[int, dict[str, Any]]:
     repo_root = Path(args.repo_root)
     state = load_state(repo_root)
     prompt_catalog_path = _resolve_prompt_catalog_path(repo_root)
@@ -3512,8 +3512,7 @@ def cmd_next(args: argparse.Namespace) -> int:
             "workflow": args.workflow,
             "requires_loop_result": True,
         }
-        print(_render_output(payload, args.format))
-        return 0
+        return (0, payload)
 
     if args.run_gates and state.status in {"NOT_STARTED", "IN_PROGRESS"}:
         gate_results = run_gates(repo_root, state.checkpoint)
@@ -3540,8 +3539,7 @@ def cmd_next(args: argparse.Namespace) -> int:
                     for r in gate_results
                 ],
             }
-            print(_render_output(payload, args.format))
-            return 1
+            return (1, payload)
 
     try:
         role, prompt_id, prompt_title, reason = _resolve_next_prompt_selection(
@@ -3561,8 +3559,7 @@ def cmd_next(args: argparse.Namespace) -> int:
             "status": state.status,
             "prompt_catalog_path": str(prompt_catalog_path) if prompt_catalog_path else None,
         }
-        print(_render_output(payload, args.format))
-        return 2
+        return (2, payload)
 
     workflow_name = str(args.workflow or "").strip()
     continuous_stop_context: ContinuousMinorStopContext | None = None
@@ -3687,8 +3684,31 @@ def cmd_next(args: argparse.Namespace) -> int:
         ]
         payload["recommended_roles"] = recommended_roles
 
+    return (0, payload)
+
+
+def cmd_next(args: argparse.Namespace) -> int:
+    code, payload = _next_payload(args)
     print(_render_output(payload, args.format))
-    return 0
+    return code
+
+
+def run_next(
+    repo_root: Path | str,
+    workflow: str | None = None,
+    *,
+    run_gates: bool = False,
+    parallel: int | None = None,
+) -> tuple[int, dict[str, Any]]:
+    """Library entry point for `next`: return (exit code, decision payload) without printing."""
+    args = argparse.Namespace(
+        repo_root=str(repo_root),
+        format="json",
+        workflow=workflow,
+        run_gates=run_gates,
+        parallel=parallel,
+    )
+    return _next_payload(args)
 
 
 def cmd_loop_result(args: argparse.Namespace) -> int:
@@ -10,8 +10,12 @@ import re
 from pathlib import Path
 
 
-_WSL_UNC_RE = re.compile(r"^//wsl(?:\.localhost)?/[^/]+/(.+)$", re.IGNORECASE)
-_WIN_DRIVE_RE = re.compile(r"^([A-Za-z]):/(.+)$")
+# One match classifies a forward-slashed path as a WSL UNC share or a drive path.
+_FOREIGN_PATH_RE = re.compile(
+    r"^(?://wsl(?:\.localhost)?/[^/]+/(?P<wsl>.+)|(?P<drive>[A-Za-z]):/(?P<tail>.+))$",
+    re.IGNORECASE | re.ASCII,
+)
+_IS_POSIX = os.name != "nt"
 
 
 def normalize_home_path(raw: str) -> Path:
@@ -23,17 +27,14 @@ def normalize_home_path(raw: str) -> Path:
     - C:\\Users\\user\\.codex -> /mnt/c/Users/user/.codex
     """
     value = raw.strip().strip('"').strip("'")
-    if os.name != "nt":
+    if _IS_POSIX:
         value = value.replace("\\", "/")
-        unc_match = _WSL_UNC_RE.match(value)
-        if unc_match:
-            value = "/" + unc_match.group(1).lstrip("/")
-        else:
-            drive_match = _WIN_DRIVE_RE.match(value)
-            if drive_match:
-                drive = drive_match.group(1).lower()
-                tail = drive_match.group(2)
-                value = f"/mnt/{drive}/{tail}"
+        m = _FOREIGN_PATH_RE.match(value)
+        if m is not None:
+            if m.group("wsl") is not None:
+                value = "/" + m.group("wsl").lstrip("/")
+            else:
+                value = f"/mnt/{m.group('drive').lower()}/{m.group('tail')}"
     return Path(value).expanduser().resolve()
 
 
@@ -39,21 +39,17 @@ def _set_status(text: str, new_status: str) -> tuple[str, bool]:
     return (updated, True)
 
 
+_WORK_LOG_HEADER_RE = re.compile(r"^[ \t]*## Work log \(current session\)[ \t\r]*$", re.M)
+
+
 def _append_work_log(text: str, line: str) -> str:
-    marker = "## Work log (current session)"
-    idx = text.find(marker)
-    if idx == -1:
+    # Splice the entry in right after the header line; the rest of the file is
+    # carried over untouched.
+    m = _WORK_LOG_HEADER_RE.search(text)
+    if m is None:
         return text + "\n\n## Work log (current session)\n- " + line + "\n"
-    # insert after marker line
-    lines = text.splitlines()
-    out = []
-    inserted = False
-    for i, ln in enumerate(lines):
-        out.append(ln)
-        if not inserted and ln.strip() == marker:
-            out.append(f"- {line}")
-            inserted = True
-    return "\n".join(out) + ("\n" if not text.endswith("\n") else "")
+    updated = text[:m.end()] + f"\n- {line}" + text[m.end():]
+    return updated if text.endswith("\n") else updated + "\n"
 
 
 def main() -> int:
@@ -9,6 +9,10 @@ Deterministic:
 - agentctl decides the next prompt id
 - prompt catalog prints the exact body
 
+Both tools are imported and called in this process when they expose
+run_next / find_entry; older copies without those entry points are run as
+subprocesses instead, as is everything under --isolate.
+
 Robust install:
 - Locates the skills root from this script's path.
 - Locates vibe-prompts as a sibling skill folder.
@@ -18,34 +22,39 @@ Robust install:
 from __future__ import annotations
 
 import argparse
+import functools
+import importlib.util
 import json
 import os
 import re
 import subprocess
 import sys
 from pathlib import Path
+from types import ModuleType
 
 
-_WSL_UNC_RE = re.compile(r"^//wsl(?:\.localhost)?/[^/]+/(.+)$", re.IGNORECASE)
-_WIN_DRIVE_RE = re.compile(r"^([A-Za-z]):/(.+)$")
+# One match classifies a forward-slashed path as a WSL UNC share or a drive path.
+_FOREIGN_PATH_RE = re.compile(
+    r"^(?://wsl(?:\.localhost)?/[^/]+/(?P<wsl>.+)|(?P<drive>[A-Za-z]):/(?P<tail>.+))$",
+    re.IGNORECASE | re.ASCII,
+)
+_IS_POSIX = os.name != "nt"
 
 
 def _normalize_home_path(raw: str) -> Path:
     value = raw.strip().strip('"').strip("'")
-    if os.name != "nt":
+    if _IS_POSIX:
         value = value.replace("\\", "/")
-        unc_match = _WSL_UNC_RE.match(value)
-        if unc_match:
-            value = "/" + unc_match.group(1).lstrip("/")
-        else:
-            drive_match = _WIN_DRIVE_RE.match(value)
-            if drive_match:
-                drive = drive_match.group(1).lower()
-                tail = drive_match.group(2)
-                value = f"/mnt/{drive}/{tail}"
+        m = _FOREIGN_PATH_RE.match(value)
+        if m is not None:
+            if m.group("wsl") is not None:
+                value = "/" + m.group("wsl").lstrip("/")
+            else:
+                value = f"/mnt/{m.group('drive').lower()}/{m.group('tail')}"
     return Path(value).expanduser().resolve()
 
 
+@functools.lru_cache(maxsize=1)
 def _skills_root_from_this_script() -> Path:
     """
     .../.codex/skills/vibe-loop/scripts/vibe_next_and_print.py
@@ -69,11 +78,24 @@ def _skills_root_env_fallback() -> Path | None:
     return _normalize_home_path(agent_home) / "skills"
 
 
+def _has_skill_dir(root: Path, name: str) -> bool:
+    """
+    True when `name` sits directly under `root` or one level down (legacy nested layouts).
+    """
+    if (root / name).is_dir():
+        return True
+    try:
+        children = list(root.iterdir())
+    except OSError:
+        return False
+    return any((child / name).is_dir() for child in children if child.is_dir())
+
+
 def _looks_like_skills_root(root: Path) -> bool:
     """
     Simple heuristics to ensure the candidate folder contains the required skills.
     """
-    return any(root.glob("**/vibe-loop")) and any(root.glob("**/vibe-prompts"))
+    return _has_skill_dir(root, "vibe-loop") and _has_skill_dir(root, "vibe-prompts")
 
 
 def _locate_skills_root() -> Path:
@@ -97,19 +119,93 @@ def _locate_skills_root() -> Path:
 
 
 def _load_stage_ordering(repo_root: Path):
-    tools_dir = repo_root / "tools"
+    return _load_stage_ordering_cached(str(repo_root))
+
+
+@functools.lru_cache(maxsize=8)
+def _load_stage_ordering_cached(repo_root: str):
+    # Load by path without adding tools/ to sys.path. Repos with a tools/ dir
+    # but no stage_ordering.py use the copy installed beside this script.
+    tools_dir = Path(repo_root) / "tools"
     if not tools_dir.exists():
         return None
-    if str(tools_dir) not in sys.path:
-        sys.path.insert(0, str(tools_dir))
+    path = next(
+        (
+            candidate
+            for candidate in (tools_dir / "stage_ordering.py", Path(__file__).resolve().parent / "stage_ordering.py")
+            if candidate.is_file()
+        ),
+        None,
+    )
+    if path is None:
+        return None
+    spec = importlib.util.spec_from_file_location("_vibe_stage_ordering", path)
+    if spec is None or spec.loader is None:
+        return None
+    module = importlib.util.module_from_spec(spec)
     try:
-        import stage_ordering  # type: ignore
+        spec.loader.exec_module(module)
     except Exception:
         return None
-    return stage_ordering
+    return module
+
+
+# Column-0 function definitions: the names a tool script defines at top level.
+_TOP_LEVEL_DEF_RE = re.compile(r"^(?:async\s+)?def\s+(\w+)\s*\(", re.MULTILINE)
+
+_TOOL_MODULES: dict[str, ModuleType | None] = {}
+_TOOL_TOP_LEVEL_DEFS: dict[str, frozenset[str]] = {}
+
+
+def _load_tool_module(path: Path, entry_point: str) -> ModuleType | None:
+    """
+    Import a tool script in-process when it exposes `entry_point`.
+
+    Only scripts that define `entry_point` at top level are imported, so thin
+    CLI shims with unguarded top-level code never run here; callers fall back
+    to running those as a subprocess. Importing a tool may add its directory
+    to sys.path and its sibling modules to sys.modules.
+    """
+    key = str(path.resolve())
+    defs = _TOOL_TOP_LEVEL_DEFS.get(key)
+    if defs is None:
+        try:
+            defs = frozenset(_TOP_LEVEL_DEF_RE.findall(path.read_text(encoding="utf-8")))
+        except (OSError, UnicodeDecodeError):
+            defs = frozenset()
+        _TOOL_TOP_LEVEL_DEFS[key] = defs
+    if entry_point not in defs:
+        return None
+
+    if key not in _TOOL_MODULES:
+        module: ModuleType | None = None
+        name = f"_vibe_tool_{path.stem}_{len(_TOOL_MODULES)}"
+        spec = importlib.util.spec_from_file_location(name, path)
+        if spec is not None and spec.loader is not None:
+            candidate = importlib.util.module_from_spec(spec)
+            sys.modules[name] = candidate
+            try:
+                spec.loader.exec_module(candidate)
+            except (Exception, SystemExit):
+                sys.modules.pop(name, None)
+            else:
+                module = candidate
+        _TOOL_MODULES[key] = module
+
+    module = _TOOL_MODULES[key]
+    if module is None or not callable(getattr(module, entry_point, None)):
+        return None
+    return module
+
 
+def _run_agentctl(repo_root: Path, agentctl_path: Path, *, isolate: bool = False) -> dict:
+    agentctl = None if isolate else _load_tool_module(agentctl_path, "run_next")
+    if agentctl is not None:
+        code, decision = agentctl.run_next(repo_root)
+        if code != 0:
+            raise RuntimeError(f"agentctl failed ({code}): {decision.get('reason') or decision}")
+        return decision
 
-def _run_agentctl(repo_root: Path, agentctl_path: Path) -> dict:
     cmd = [
         sys.executable,
         str(agentctl_path),
@@ -125,7 +221,26 @@ def _run_agentctl(repo_root: Path, agentctl_path: Path) -> dict:
     return json.loads(p.stdout)
 
 
-def _print_prompt(prompt_catalog_path: Path, catalog_path: Path, prompt_id: str) -> None:
+def _print_prompt(
+    prompt_catalog_path: Path,
+    catalog_path: Path,
+    prompt_id: str,
+    *,
+    isolate: bool = False,
+) -> None:
+    prompt_catalog = None if isolate else _load_tool_module(prompt_catalog_path, "find_entry")
+    if prompt_catalog is not None:
+        # Older prompt_catalog copies have no index; they get a list scan.
+        load = getattr(prompt_catalog, "load_catalog_index", prompt_catalog.load_catalog)
+        try:
+            entry = prompt_catalog.find_entry(load(catalog_path), prompt_id)
+        except (OSError, ValueError) as exc:
+            raise RuntimeError(f"prompt_catalog get failed: {exc}") from exc
+        if entry is None:
+            raise RuntimeError(f"prompt_catalog get failed (2): ERROR: prompt not found: {prompt_id}")
+        sys.stdout.write(entry.body + "\n")
+        return
+
     cmd = [
         sys.executable,
         str(prompt_catalog_path),
@@ -133,20 +248,20 @@ def _print_prompt(prompt_catalog_path: Path, catalog_path: Path, prompt_id: str)
         "get",
         prompt_id,
     ]
+    # Older prompt_catalog copies do not reconfigure stdout themselves.
     env = os.environ.copy()
     env.setdefault("PYTHONIOENCODING", "utf-8")
-    p = subprocess.run(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        encoding="utf-8",
-        errors="replace",
-        env=env,
-    )
+    p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
     if p.returncode != 0:
-        raise RuntimeError(f"prompt_catalog get failed ({p.returncode}): {p.stderr.strip() or p.stdout.strip()}")
-    sys.stdout.write(p.stdout)
+        detail = (p.stderr.strip() or p.stdout.strip()).decode("utf-8", errors="replace")
+        raise RuntimeError(f"prompt_catalog get failed ({p.returncode}): {detail}")
+    # The child already wrote UTF-8; pass the bytes through instead of decoding and re-encoding.
+    out = getattr(sys.stdout, "buffer", None)
+    if out is None:
+        sys.stdout.write(p.stdout.decode("utf-8", errors="replace"))
+        return
+    sys.stdout.flush()
+    out.write(p.stdout)
 
 
 def _default_catalog_candidates(repo_root: Path, skills_root: Path) -> list[Path]:
@@ -158,6 +273,70 @@ def _default_catalog_candidates(repo_root: Path, skills_root: Path) -> list[Path
     ]
 
 
+_RESOLVED_PATHS: dict[tuple[str, str], tuple[Path | None, Path | None, Path]] = {}
+
+
+def _first_existing(candidates: list[Path], listings: dict[Path, frozenset[str]]) -> Path | None:
+    """
+    Return the first candidate present on disk, listing each parent directory once.
+
+    The winner still gets a real exists() check so broken symlinks are skipped.
+    """
+    for path in candidates:
+        names = listings.get(path.parent)
+        if names is None:
+            try:
+                with os.scandir(path.parent) as it:
+                    names = frozenset(entry.name for entry in it)
+            except OSError:
+                names = frozenset()
+            listings[path.parent] = names
+        if path.name in names and path.exists():
+            return path
+    return None
+
+
+def _resolve_paths(repo_root: Path, skills_root: Path) -> tuple[Path | None, Path | None, Path]:
+    """
+    Return (agentctl_path, prompt_catalog_path, default_catalog_path) for `repo_root`.
+
+    Only fully resolved results are memoized, so a later call can still pick up
+    tools that were missing the first time.
+    """
+    key = (str(repo_root), str(skills_root))
+    cached = _RESOLVED_PATHS.get(key)
+    if cached is not None:
+        return cached
+
+    # Prefer repo-local tools when available to keep decisions aligned with the repo.
+    repo_tools_dir = repo_root / "tools"
+    fallback_tools_dir = skills_root.parent / "tools"
+    installed_tools_dir = skills_root / "vibe-loop" / "scripts"
+    installed_prompt_dir = skills_root / "vibe-prompts" / "scripts"
+
+    agentctl_candidates = [
+        repo_tools_dir / "agentctl.py",
+        fallback_tools_dir / "agentctl.py",
+        installed_tools_dir / "agentctl.py",
+    ]
+    prompt_candidates = [
+        repo_tools_dir / "prompt_catalog.py",
+        fallback_tools_dir / "prompt_catalog.py",
+        installed_prompt_dir / "prompt_catalog.py",
+    ]
+
+    listings: dict[Path, frozenset[str]] = {}
+    agentctl_path = _first_existing(agentctl_candidates, listings)
+    prompt_catalog_path = _first_existing(prompt_candidates, listings)
+    catalog_candidates = _default_catalog_candidates(repo_root, skills_root)
+    catalog_path = _first_existing(catalog_candidates, listings) or catalog_candidates[0]
+
+    resolved = (agentctl_path, prompt_catalog_path, catalog_path)
+    if agentctl_path is not None and prompt_catalog_path is not None and catalog_path.exists():
+        _RESOLVED_PATHS[key] = resolved
+    return resolved
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(prog="vibe_next_and_print.py")
     ap.add_argument("--repo-root", default=".", help="Target repo root (default: .)")
@@ -171,6 +350,11 @@ def main() -> int:
         action="store_true",
         help="Print the decision JSON to stderr before printing the prompt body.",
     )
+    ap.add_argument(
+        "--isolate",
+        action="store_true",
+        help="Run agentctl and prompt_catalog as subprocesses instead of importing them.",
+    )
     args = ap.parse_args()
 
     if hasattr(sys.stdout, "reconfigure"):
@@ -188,25 +372,7 @@ def main() -> int:
     # Locate skill install layout (prefers AGENT_HOME when present).
     skills_root = _locate_skills_root()
 
-    # Prefer repo-local tools when available to keep decisions aligned with the repo.
-    repo_tools_dir = repo_root / "tools"
-    fallback_tools_dir = skills_root.parent / "tools"
-    installed_tools_dir = skills_root / "vibe-loop" / "scripts"
-    installed_prompt_dir = skills_root / "vibe-prompts" / "scripts"
-
-    agentctl_candidates = [
-        repo_tools_dir / "agentctl.py",
-        fallback_tools_dir / "agentctl.py",
-        installed_tools_dir / "agentctl.py",
-    ]
-    prompt_candidates = [
-        repo_tools_dir / "prompt_catalog.py",
-        fallback_tools_dir / "prompt_catalog.py",
-        installed_prompt_dir / "prompt_catalog.py",
-    ]
-
-    agentctl_path = next((p for p in agentctl_candidates if p.exists()), None)
-    prompt_catalog_path = next((p for p in prompt_candidates if p.exists()), None)
+    agentctl_path, prompt_catalog_path, default_catalog_path = _resolve_paths(repo_root, skills_root)
 
     if agentctl_path is None:
         print("ERROR: agentctl.py not found in repo or skills tools.", file=sys.stderr)
@@ -216,7 +382,7 @@ def main() -> int:
         print("ERROR: prompt_catalog.py not found in repo or skills tools.", file=sys.stderr)
         return 2
 
-    decision = _run_agentctl(repo_root, agentctl_path)
+    decision = _run_agentctl(repo_root, agentctl_path, isolate=args.isolate)
     if stage_ordering and decision.get("stage"):
         try:
             stage_ordering.stage_sort_key(decision["stage"])
@@ -241,8 +407,7 @@ def main() -> int:
     elif args.catalog:
         catalog_path = Path(args.catalog).expanduser().resolve()
     else:
-        catalog_candidates = _default_catalog_candidates(repo_root, skills_root)
-        catalog_path = next((path for path in catalog_candidates if path.exists()), catalog_candidates[0])
+        catalog_path = default_catalog_path
 
     if not catalog_path.exists():
         print(f"ERROR: catalog not found at: {catalog_path}", file=sys.stderr)
@@ -253,7 +418,7 @@ def main() -> int:
     if decision.get("recommended_role") == "stop" or prompt_id == "stop":
         return 0
 
-    _print_prompt(prompt_catalog_path, catalog_path, prompt_id)
+    _print_prompt(prompt_catalog_path, catalog_path, prompt_id, isolate=args.isolate)
     return 0
 
 
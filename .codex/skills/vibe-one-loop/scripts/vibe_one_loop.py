@@ -3,13 +3,13 @@
 vibe_one_loop.py
 
 Compatibility wrapper for one-shot loop execution.
-Delegates to vibe-loop's vibe_next_and_print.py.
+Delegates to vibe-loop's vibe_next_and_print.py, run in this interpreter.
 """
 
 from __future__ import annotations
 
 import argparse
-import subprocess
+import runpy
 import sys
 from pathlib import Path
 
@@ -28,6 +28,24 @@ def _find_loop_script(repo_root: Path) -> Path | None:
     return next((p for p in candidates if p.exists()), None)
 
 
+def _run_script(script: Path, argv: list[str]) -> int:
+    """
+    Run `script` as __main__ in this process, translating SystemExit into a return code.
+    """
+    saved_argv = sys.argv
+    sys.argv = [str(script), *argv]
+    try:
+        runpy.run_path(str(script), run_name="__main__")
+    except SystemExit as exc:
+        if exc.code is None or isinstance(exc.code, int):
+            return int(exc.code or 0)
+        print(exc.code, file=sys.stderr)
+        return 1
+    finally:
+        sys.argv = saved_argv
+    return 0
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(prog="vibe_one_loop.py")
     ap.add_argument("--repo-root", default=".", help="Target repo root (default: current directory)")
@@ -45,14 +63,13 @@ def main() -> int:
         print("ERROR: could not locate vibe-loop/scripts/vibe_next_and_print.py", file=sys.stderr)
         return 2
 
-    cmd = [sys.executable, str(loop_script), "--repo-root", str(repo_root)]
+    loop_args = ["--repo-root", str(repo_root)]
     if args.catalog:
-        cmd.extend(["--catalog", str(Path(args.catalog).expanduser().resolve())])
+        loop_args.extend(["--catalog", str(Path(args.catalog).expanduser().resolve())])
     if args.show_decision:
-        cmd.append("--show-decision")
+        loop_args.append("--show-decision")
 
-    p = subprocess.run(cmd)
-    return int(p.returncode)
+    return _run_script(loop_script, loop_args)
 
 
 if __name__ == "__main__":
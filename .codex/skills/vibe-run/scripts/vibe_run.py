@@ -6,42 +6,150 @@ Continuous loop helper:
 1) Ask agentctl for the next prompt
 2) Print the prompt body
 3) Repeat until dispatcher returns stop
+
+agentctl and prompt_catalog are imported and called in this process when they
+expose run_next, main and find_entry; older copies are run as subprocesses instead.
 """
 
 from __future__ import annotations
 
 import argparse
+import contextlib
+import functools
+import importlib.util
+import io
 import json
 import os
+import re
+import shlex
+import shutil
 import subprocess
 import sys
+import threading
+import traceback
+from collections import deque
 from pathlib import Path
+from types import ModuleType
 
 
+@functools.lru_cache(maxsize=1)
 def _skills_root_from_this_script() -> Path:
     # .../.codex/skills/vibe-run/scripts/vibe_run.py -> .../.codex/skills
     return Path(__file__).resolve().parents[2]
 
 
+# Column-0 function definitions: the names a tool script defines at top level.
+_TOP_LEVEL_DEF_RE = re.compile(r"^(?:async\s+)?def\s+(\w+)\s*\(", re.MULTILINE)
+
+_TOOL_MODULES: dict[str, ModuleType | None] = {}
+_TOOL_TOP_LEVEL_DEFS: dict[str, frozenset[str]] = {}
+
+
+def _load_tool_module(path: Path, entry_point: str) -> ModuleType | None:
+    """
+    Import a tool script in-process when it exposes `entry_point`.
+
+    Only scripts that define `entry_point` at top level are imported, so thin
+    CLI shims with unguarded top-level code never run here; callers fall back
+    to running those as a subprocess. Importing a tool may add its directory
+    to sys.path and its sibling modules to sys.modules.
+    """
+    key = str(path.resolve())
+    defs = _TOOL_TOP_LEVEL_DEFS.get(key)
+    if defs is None:
+        try:
+            defs = frozenset(_TOP_LEVEL_DEF_RE.findall(path.read_text(encoding="utf-8")))
+        except (OSError, UnicodeDecodeError):
+            defs = frozenset()
+        _TOOL_TOP_LEVEL_DEFS[key] = defs
+    if entry_point not in defs:
+        return None
+
+    if key not in _TOOL_MODULES:
+        module: ModuleType | None = None
+        name = f"_vibe_tool_{path.stem}_{len(_TOOL_MODULES)}"
+        spec = importlib.util.spec_from_file_location(name, path)
+        if spec is not None and spec.loader is not None:
+            candidate = importlib.util.module_from_spec(spec)
+            sys.modules[name] = candidate
+            try:
+                spec.loader.exec_module(candidate)
+            except (Exception, SystemExit):
+                sys.modules.pop(name, None)
+            else:
+                module = candidate
+        _TOOL_MODULES[key] = module
+
+    module = _TOOL_MODULES[key]
+    if module is None or not callable(getattr(module, entry_point, None)):
+        return None
+    return module
+
+
+def _call_agentctl(agentctl_path: Path, argv: list[str]) -> tuple[int, str, str]:
+    """
+    Run one agentctl command and return (exit code, stdout, stderr).
+
+    In-process calls capture output the same way the subprocess path does, so
+    callers see identical results either way.
+    """
+    agentctl = _load_tool_module(agentctl_path, "main")
+    if agentctl is None:
+        p = subprocess.run(
+            [sys.executable, str(agentctl_path), *argv],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        return p.returncode, p.stdout, p.stderr
+
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            code = agentctl.main(argv)
+        except SystemExit as exc:
+            if exc.code is None or isinstance(exc.code, int):
+                code = exc.code or 0
+            else:
+                print(exc.code, file=sys.stderr)
+                code = 1
+        except Exception:
+            traceback.print_exc()
+            code = 1
+    return int(code or 0), out.getvalue(), err.getvalue()
+
+
 def _run_agentctl_next(repo_root: Path, agentctl_path: Path, workflow: str = "") -> dict:
-    cmd = [
-        sys.executable,
-        str(agentctl_path),
-        "--repo-root",
-        str(repo_root),
-        "--format",
-        "json",
-        "next",
-    ]
+    agentctl = _load_tool_module(agentctl_path, "run_next")
+    if agentctl is not None:
+        code, decision = agentctl.run_next(repo_root, workflow or None)
+        if code != 0:
+            raise RuntimeError(f"agentctl failed ({code}): {decision.get('reason') or decision}")
+        return decision
+
+    argv = ["--repo-root", str(repo_root), "--format", "json", "next"]
     if workflow:
-        cmd.extend(["--workflow", workflow])
-    p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    if p.returncode != 0:
-        raise RuntimeError(f"agentctl failed ({p.returncode}): {p.stderr.strip() or p.stdout.strip()}")
-    return json.loads(p.stdout)
+        argv.extend(["--workflow", workflow])
+    code, out, err = _call_agentctl(agentctl_path, argv)
+    if code != 0:
+        raise RuntimeError(f"agentctl failed ({code}): {err.strip() or out.strip()}")
+    return json.loads(out)
 
 
 def _print_prompt(prompt_catalog_path: Path, catalog_path: Path, prompt_id: str) -> None:
+    prompt_catalog = _load_tool_module(prompt_catalog_path, "find_entry")
+    if prompt_catalog is not None:
+        # Older prompt_catalog copies have no index; they get a list scan.
+        load = getattr(prompt_catalog, "load_catalog_index", prompt_catalog.load_catalog)
+        try:
+            entry = prompt_catalog.find_entry(load(catalog_path), prompt_id)
+        except (OSError, ValueError) as exc:
+            raise RuntimeError(f"prompt_catalog get failed: {exc}") from exc
+        if entry is None:
+            raise RuntimeError(f"prompt_catalog get failed (2): ERROR: prompt not found: {prompt_id}")
+        sys.stdout.write(entry.body + "\n")
+        return
+
     cmd = [sys.executable, str(prompt_catalog_path), str(catalog_path), "get", prompt_id]
     p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
     if p.returncode != 0:
@@ -50,9 +158,7 @@ def _print_prompt(prompt_catalog_path: Path, catalog_path: Path, prompt_id: str)
 
 
 def _record_loop_result(agentctl_path: Path, repo_root: Path, loop_result_line: str) -> None:
-    cmd = [
-        sys.executable,
-        str(agentctl_path),
+    argv = [
         "--repo-root",
         str(repo_root),
         "--format",
@@ -61,18 +167,74 @@ def _record_loop_result(agentctl_path: Path, repo_root: Path, loop_result_line:
         "--line",
         loop_result_line,
     ]
-    p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    if p.returncode != 0:
-        raise RuntimeError(p.stderr.strip() or p.stdout.strip() or "loop-result command failed.")
+    code, out, err = _call_agentctl(agentctl_path, argv)
+    if code != 0:
+        raise RuntimeError(err.strip() or out.strip() or "loop-result command failed.")
+
+
+# Characters str.splitlines() treats as line boundaries.
+_LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+_LINE_BREAK_RE = re.compile(f"[{_LINE_BREAKS}]")
 
 
 def _extract_loop_result_line(output: str) -> str | None:
-    found: str | None = None
-    for raw in output.splitlines():
-        line = raw.strip()
-        if line.startswith("LOOP_RESULT:"):
-            found = line
-    return found
+    """
+    Return the last line that starts with LOOP_RESULT: (ignoring surrounding
+    whitespace), scanning backwards from the end of the output.
+    """
+    marker = "LOOP_RESULT:"
+    end = len(output)
+    while True:
+        idx = output.rfind(marker, 0, end)
+        if idx < 0:
+            return None
+        start = idx
+        while start > 0 and output[start - 1].isspace() and output[start - 1] not in _LINE_BREAKS:
+            start -= 1
+        if start == 0 or output[start - 1] in _LINE_BREAKS:
+            m = _LINE_BREAK_RE.search(output, idx)
+            return output[idx : m.start() if m else len(output)].rstrip()
+        end = idx
+
+
+# role -> (loop, result, next_role_hint) recorded for simulated loops.
+_SIMULATED_ROLE_RESULTS: dict[str, tuple[str, str, str]] = {
+    "design": ("design", "updated", "implement|issues_triage|stop"),
+    "implement": ("implement", "ready_for_review", "review|issues_triage"),
+    "review": ("review", "pass", "implement|consolidation|issues_triage|stop"),
+    "issues_triage": ("issues_triage", "resolved", "implement|review|issues_triage|stop"),
+    "advance": ("advance", "advanced", "implement|stop"),
+    "consolidation": ("consolidation", "aligned", "context_capture|implement|issues_triage"),
+    "context_capture": ("context_capture", "updated", "implement|review|issues_triage|stop"),
+    "improvements": ("improvements", "completed", "implement|review|issues_triage|stop"),
+}
+_SIMULATED_DEFAULT_RESULT = ("implement", "blocked", "issues_triage")
+
+# Static parts of the simulated report; only serialized, never mutated.
+_SIMULATED_ACCEPTANCE_MATRIX = [
+    {
+        "item": "Simulated non-interactive loop acknowledgement",
+        "status": "N/A",
+        "evidence": (
+            "vibe-run used --simulate-loop-result without an executor; "
+            "prompt was emitted but not executed."
+        ),
+        "critical": False,
+        "confidence": 1.0,
+        "evidence_strength": "LOW",
+    }
+]
+_SIMULATED_TOP_FINDINGS = [
+    {
+        "impact": "QUESTION",
+        "title": "Loop result was simulated",
+        "evidence": (
+            "No executor command was provided, so this run only acknowledged "
+            "the loop protocol for non-interactive continuity."
+        ),
+        "action": "Use --executor or interactive mode for real loop execution.",
+    }
+]
 
 
 def _simulated_loop_result_line(decision: dict) -> str:
@@ -81,46 +243,11 @@ def _simulated_loop_result_line(decision: dict) -> str:
     checkpoint = str(decision.get("checkpoint") or "").strip()
     status = str(decision.get("status") or "").strip()
 
-    role_map = {
-        "design": ("design", "updated", "implement|issues_triage|stop"),
-        "implement": ("implement", "ready_for_review", "review|issues_triage"),
-        "review": ("review", "pass", "implement|consolidation|issues_triage|stop"),
-        "issues_triage": ("issues_triage", "resolved", "implement|review|issues_triage|stop"),
-        "advance": ("advance", "advanced", "implement|stop"),
-        "consolidation": ("consolidation", "aligned", "context_capture|implement|issues_triage"),
-        "context_capture": ("context_capture", "updated", "implement|review|issues_triage|stop"),
-        "improvements": ("improvements", "completed", "implement|review|issues_triage|stop"),
-    }
-    loop_name, result, next_role_hint = role_map.get(
-        role,
-        ("implement", "blocked", "issues_triage"),
-    )
+    loop_name, result, next_role_hint = _SIMULATED_ROLE_RESULTS.get(role, _SIMULATED_DEFAULT_RESULT)
 
     report = {
-        "acceptance_matrix": [
-            {
-                "item": "Simulated non-interactive loop acknowledgement",
-                "status": "N/A",
-                "evidence": (
-                    "vibe-run used --simulate-loop-result without an executor; "
-                    "prompt was emitted but not executed."
-                ),
-                "critical": False,
-                "confidence": 1.0,
-                "evidence_strength": "LOW",
-            }
-        ],
-        "top_findings": [
-            {
-                "impact": "QUESTION",
-                "title": "Loop result was simulated",
-                "evidence": (
-                    "No executor command was provided, so this run only acknowledged "
-                    "the loop protocol for non-interactive continuity."
-                ),
-                "action": "Use --executor or interactive mode for real loop execution.",
-            }
-        ],
+        "acceptance_matrix": _SIMULATED_ACCEPTANCE_MATRIX,
+        "top_findings": _SIMULATED_TOP_FINDINGS,
         "state_transition": {
             "before": {"stage": stage, "checkpoint": checkpoint, "status": status},
             "after": {"stage": stage, "checkpoint": checkpoint, "status": status},
@@ -146,15 +273,82 @@ def _simulated_loop_result_line(decision: dict) -> str:
     return "LOOP_RESULT: " + json.dumps(payload, separators=(",", ":"))
 
 
+# Lines of executor output kept per stream for the failure message.
+_EXECUTOR_TAIL_LINES = 200
+
+
+def _pump_executor_stream(stream, sink, result: dict) -> None:
+    """
+    Forward `stream` to `sink` line by line, remembering the last LOOP_RESULT
+    line and a bounded tail of output instead of buffering everything.
+
+    Output is passed through as bytes; only LOOP_RESULT lines and the tail
+    are decoded.
+    """
+    sink.flush()
+    raw_sink = getattr(sink, "buffer", None)
+    tail: deque[bytes] = deque(maxlen=_EXECUTOR_TAIL_LINES)
+    found: str | None = None
+    for chunk in stream:
+        if raw_sink is not None:
+            raw_sink.write(chunk)
+            raw_sink.flush()
+        else:
+            sink.write(chunk.decode("utf-8", errors="replace"))
+            sink.flush()
+        tail.append(chunk)
+        if b"LOOP_RESULT:" in chunk:
+            found = _extract_loop_result_line(chunk.decode("utf-8", errors="replace")) or found
+    result["loop_result"] = found
+    result["tail"] = b"".join(tail).decode("utf-8", errors="replace")
+
+
+def _executor_base_env(repo_root: Path) -> dict[str, str]:
+    """
+    Environment shared by every executor run; built once per vibe_run invocation.
+    """
+    env = dict(os.environ)
+    env["VIBE_REPO_ROOT"] = str(repo_root)
+    return env
+
+
+# Anything here needs a real shell (pipes, redirection, expansion, globbing, ...).
+_SHELL_SYNTAX_CHARS = frozenset("|&;<>()$`\\*?[]{}~#!\n")
+
+
+def _executor_argv(executor_cmd: str, repo_root: Path) -> list[str] | None:
+    """
+    Split a plain `program arg ...` executor command so it can be run without
+    an intermediate shell. Returns None when the shell should handle it.
+    """
+    if os.name != "posix" or _SHELL_SYNTAX_CHARS.intersection(executor_cmd):
+        return None
+    try:
+        argv = shlex.split(executor_cmd)
+    except ValueError:
+        return None
+    if not argv:
+        return None
+    program = argv[0]
+    if "/" in program:
+        # Relative paths resolve against the executor's cwd, as the shell would.
+        target = repo_root / program
+        runnable = target.is_file() and os.access(target, os.X_OK)
+    else:
+        runnable = shutil.which(program) is not None
+    return argv if runnable else None
+
+
 def _run_executor(
     executor_cmd: str,
     repo_root: Path,
     decision: dict,
+    base_env: dict[str, str] | None = None,
+    executor_argv: list[str] | None = None,
 ) -> str:
-    env = os.environ.copy()
+    env = (base_env or _executor_base_env(repo_root)).copy()
     env.update(
         {
-            "VIBE_REPO_ROOT": str(repo_root),
             "VIBE_DECISION_JSON": json.dumps(decision, separators=(",", ":")),
             "VIBE_RECOMMENDED_ROLE": str(decision.get("recommended_role") or ""),
             "VIBE_PROMPT_ID": str(decision.get("recommended_prompt_id") or ""),
@@ -163,26 +357,42 @@ def _run_executor(
             "VIBE_STATUS": str(decision.get("status") or ""),
         }
     )
-    p = subprocess.run(
-        executor_cmd,
-        shell=True,
-        cwd=str(repo_root),
-        env=env,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
-    if p.stdout:
-        sys.stdout.write(p.stdout)
-    if p.stderr:
-        sys.stderr.write(p.stderr)
-    if p.returncode != 0:
+    # Keep this spawn free of preexec_fn, user/group changes and
+    # start_new_session: CPython then starts the child with vfork/posix_spawn
+    # rather than a full fork of this (possibly large) process.
+    popen_kwargs = dict(cwd=str(repo_root), env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if executor_argv:
+        try:
+            p = subprocess.Popen(executor_argv, **popen_kwargs)
+        except OSError:
+            # e.g. an executable script without a shebang (ENOEXEC): the shell
+            # knows how to run those, so hand the command back to it.
+            p = subprocess.Popen(executor_cmd, shell=True, **popen_kwargs)
+    else:
+        p = subprocess.Popen(executor_cmd, shell=True, **popen_kwargs)
+    # Drain both pipes concurrently so output is shown live and neither blocks.
+    out: dict = {}
+    err: dict = {}
+    pumps = [
+        threading.Thread(target=_pump_executor_stream, args=(p.stdout, sys.stdout, out), daemon=True),
+        threading.Thread(target=_pump_executor_stream, args=(p.stderr, sys.stderr, err), daemon=True),
+    ]
+    for pump in pumps:
+        pump.start()
+    returncode = p.wait()
+    for pump in pumps:
+        pump.join()
+    p.stdout.close()
+    p.stderr.close()
+
+    if returncode != 0:
         raise RuntimeError(
-            f"executor failed ({p.returncode}). "
-            f"stdout={p.stdout.strip()!r} stderr={p.stderr.strip()!r}"
+            f"executor failed ({returncode}). "
+            f"stdout={out.get('tail', '').strip()!r} stderr={err.get('tail', '').strip()!r}"
         )
 
-    loop_result_line = _extract_loop_result_line((p.stdout or "") + "\n" + (p.stderr or ""))
+    # stderr is scanned after stdout, so its last LOOP_RESULT line wins.
+    loop_result_line = err.get("loop_result") or out.get("loop_result")
     if not loop_result_line:
         raise RuntimeError(
             "executor completed but did not emit LOOP_RESULT line. "
@@ -239,16 +449,23 @@ def _default_catalog_candidates(repo_root: Path, skills_root: Path) -> list[Path
     ]
 
 
-def _resolve_catalog_path(repo_root: Path, decision: dict, user_catalog: str) -> Path:
-    decision_catalog = decision.get("prompt_catalog_path")
-    if isinstance(decision_catalog, str) and decision_catalog:
-        return Path(decision_catalog).expanduser().resolve()
+def _default_catalog_path(repo_root: Path, user_catalog: str) -> Path:
+    """
+    Catalog used when a decision does not name one; resolved once per run.
+    """
     if user_catalog:
         return Path(user_catalog).expanduser().resolve()
 
     skills_root = _skills_root_from_this_script()
     candidates = _default_catalog_candidates(repo_root, skills_root)
     return next((path for path in candidates if path.exists()), candidates[0])
+
+
+def _resolve_catalog_path(decision: dict, default_catalog: Path) -> Path:
+    decision_catalog = decision.get("prompt_catalog_path")
+    if isinstance(decision_catalog, str) and decision_catalog:
+        return Path(decision_catalog).expanduser().resolve()
+    return default_catalog
 
 
 def _record_workflow_approval(
@@ -257,9 +474,7 @@ def _record_workflow_approval(
     workflow: str,
     approved_ids: str,
 ) -> None:
-    cmd = [
-        sys.executable,
-        str(agentctl_path),
+    argv = [
         "--repo-root",
         str(repo_root),
         "--format",
@@ -270,9 +485,9 @@ def _record_workflow_approval(
         "--ids",
         approved_ids,
     ]
-    p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    if p.returncode != 0:
-        raise RuntimeError(p.stderr.strip() or p.stdout.strip() or "workflow-approve command failed.")
+    code, out, err = _call_agentctl(agentctl_path, argv)
+    if code != 0:
+        raise RuntimeError(err.strip() or out.strip() or "workflow-approve command failed.")
 
 
 def _try_approval_continue(
@@ -329,7 +544,8 @@ def _try_approval_continue(
             print(f"ERROR: {exc}", file=sys.stderr)
 
 
-def main() -> int:
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
     ap = argparse.ArgumentParser(prog="vibe_run.py")
     ap.add_argument("--repo-root", default=".", help="Target repo root (default: current directory)")
     ap.add_argument("--catalog", default="", help="Optional path to template_prompts.md")
@@ -357,7 +573,11 @@ def main() -> int:
             "Use for non-interactive dry-runs without an executor."
         ),
     )
-    args = ap.parse_args()
+    return ap
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
 
     repo_root = Path(args.repo_root).expanduser().resolve()
     if not repo_root.exists():
@@ -369,6 +589,12 @@ def main() -> int:
     except RuntimeError as exc:
         print(f"ERROR: {exc}", file=sys.stderr)
         return 2
+    default_catalog = _default_catalog_path(repo_root, args.catalog)
+    executor_env = _executor_base_env(repo_root) if args.executor else None
+    executor_argv = _executor_argv(args.executor, repo_root) if args.executor else None
+    stdin_is_tty = sys.stdin.isatty()
+    # Catalogs already confirmed to exist; a missing one ends the run anyway.
+    known_catalogs: set[Path] = set()
 
     loop_count = 0
     while True:
@@ -405,10 +631,12 @@ def main() -> int:
             print(f"ERROR: missing recommended_prompt_id in decision: {decision}", file=sys.stderr)
             return 2
 
-        catalog_path = _resolve_catalog_path(repo_root, decision, args.catalog)
-        if not catalog_path.exists():
-            print(f"ERROR: prompt catalog not found: {catalog_path}", file=sys.stderr)
-            return 2
+        catalog_path = _resolve_catalog_path(decision, default_catalog)
+        if catalog_path not in known_catalogs:
+            if not catalog_path.exists():
+                print(f"ERROR: prompt catalog not found: {catalog_path}", file=sys.stderr)
+                return 2
+            known_catalogs.add(catalog_path)
 
         try:
             _print_prompt(prompt_catalog_path, catalog_path, prompt_id)
@@ -419,7 +647,13 @@ def main() -> int:
         loop_count += 1
         if args.executor:
             try:
-                loop_result_line = _run_executor(args.executor, repo_root, decision)
+                loop_result_line = _run_executor(
+                    args.executor,
+                    repo_root,
+                    decision,
+                    executor_env,
+                    executor_argv,
+                )
                 _record_loop_result(agentctl_path, repo_root, loop_result_line)
             except RuntimeError as exc:
                 print(f"ERROR: {exc}", file=sys.stderr)
@@ -446,7 +680,7 @@ def main() -> int:
                 file=sys.stderr,
             )
             return 2
-        if not sys.stdin.isatty():
+        if not stdin_is_tty:
             print("NOTE: stdin is not interactive; stopping after one loop.", file=sys.stderr)
             return 0
         try:
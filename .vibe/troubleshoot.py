@@ -4,15 +4,21 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import re
 import sys
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass, fields, is_dataclass
 from pathlib import Path
+from typing import Iterable, Iterator
 
-ALLOWED_STATUS = {"NOT_STARTED", "IN_PROGRESS", "IN_REVIEW", "BLOCKED", "DONE"}
-ALLOWED_ISSUE_IMPACT = {"QUESTION", "MINOR", "MAJOR", "BLOCKER"}
-ALLOWED_ISSUE_STATUS = {"OPEN", "IN_PROGRESS", "BLOCKED", "RESOLVED"}
+ALLOWED_STATUS = frozenset({"NOT_STARTED", "IN_PROGRESS", "IN_REVIEW", "BLOCKED", "DONE"})
+ALLOWED_ISSUE_IMPACT = frozenset({"QUESTION", "MINOR", "MAJOR", "BLOCKER"})
+ALLOWED_ISSUE_STATUS = frozenset({"OPEN", "IN_PROGRESS", "BLOCKED", "RESOLVED"})
+
+_ALLOWED_STATUS_TEXT = ", ".join(sorted(ALLOWED_STATUS))
+_ALLOWED_ISSUE_IMPACT_TEXT = ", ".join(sorted(ALLOWED_ISSUE_IMPACT))
+_ALLOWED_ISSUE_STATUS_TEXT = ", ".join(sorted(ALLOWED_ISSUE_STATUS))
 
 REQUIRED_STATE_SECTIONS = (
     "Current focus",
@@ -36,6 +42,42 @@ REQUIRED_CHECKPOINT_FIELDS = (
 _STAGE_RE = re.compile(r"^\d+[A-Za-z]*$")
 _CHECKPOINT_RE = re.compile(r"^(\d+[A-Za-z]*)\.(\d+)$")
 
+_SECTION_HEADER_RE = re.compile(r"^##\s+(.+?)\s*$")
+_FOCUS_KV_RE = re.compile(r"^\s*-\s*([^:]+):\s*(.+?)\s*$")
+_NON_KEY_CHARS_RE = re.compile(r"[^a-z0-9]+")
+# ASCII fast path for _normalize_key: a bytes.translate table mapping every
+# byte outside [a-z0-9] to "_".
+_KEY_TRANSLATE = bytes(code if chr(code) in "abcdefghijklmnopqrstuvwxyz0123456789" else ord("_") for code in range(256))
+# An issue line is either a checkbox head ("- [ ] ISSUE-1: ...") or a
+# "- Key: value" detail; the two never match the same line.
+_ISSUE_LINE_RE = re.compile(
+    r"^\s*-\s*(?:\[\s*[xX ]?\s*\]\s*(?P<head>.+?)|(?P<key>[A-Za-z][A-Za-z _-]*)\s*:\s*(?P<val>.+?))\s*$"
+)
+_ISSUE_ID_RE = re.compile(r"(?i)^(ISSUE-[A-Za-z0-9_.-]+)\s*:\s*(.+)$")
+# Same case rules as _ISSUE_ID_RE, used to skip sections without any issue.
+_ISSUE_MARKER_RE = re.compile(r"(?i)ISSUE-")
+_STAGE_HEADING_RE = re.compile(r"^(#{2,6})\s+(?:\(\s*SKIP\s*\)\s+)?Stage\s+([0-9A-Za-z]+)\s*[—–-]?\s*(.*)$")
+_CHECKPOINT_HEADING_RE = re.compile(
+    r"^(#{3,6})\s+(?:\(\s*(?:DONE|SKIPPED|SKIP)\s*\)\s+)?([0-9A-Za-z]+\.\d+)\s*[—–-]?\s*(.*)$"
+)
+# Matches a single line naming one required field; the named group that
+# matched (f0, f1, ...) indexes REQUIRED_CHECKPOINT_FIELDS.
+_CHECKPOINT_FIELD_LINE_RE = re.compile(
+    r"(?i)^\s*(?:[-*]\s*)?(?:\*\*)?\s*(?:"
+    + "|".join(f"(?P<f{idx}>{re.escape(field)})" for idx, field in enumerate(REQUIRED_CHECKPOINT_FIELDS))
+    + r")\s*:?(?:\*\*)?\s*$"
+)
+
+_ISSUE_KEY_ALIASES = {
+    "impact": "impact",
+    "status": "status",
+    "owner": "owner",
+    "unblock_condition": "unblock_condition",
+    "unblock": "unblock_condition",
+    "evidence_needed": "evidence_needed",
+    "evidence": "evidence_needed",
+}
+
 
 @dataclass(frozen=True)
 class Issue:
@@ -99,7 +141,7 @@ def _section_map(text: str) -> dict[str, list[str]]:
     sections: dict[str, list[str]] = {}
     current: str | None = None
     for line in text.splitlines():
-        match = re.match(r"^##\s+(.+?)\s*$", line)
+        match = _SECTION_HEADER_RE.match(line) if line.startswith("##") else None
         if match:
             current = match.group(1).strip()
             sections[current] = []
@@ -109,69 +151,63 @@ def _section_map(text: str) -> dict[str, list[str]]:
     return sections
 
 
+def _normalize_key(raw_key: str) -> str:
+    """Lower-case `raw_key` and collapse each run of non [a-z0-9] characters to "_"."""
+    lowered = raw_key.strip().lower()
+    if not lowered.isascii():
+        return _NON_KEY_CHARS_RE.sub("_", lowered).strip("_")
+    normalized = lowered.encode("ascii").translate(_KEY_TRANSLATE).decode("ascii")
+    while "__" in normalized:
+        normalized = normalized.replace("__", "_")
+    return normalized.strip("_")
+
+
+@functools.lru_cache(maxsize=64)
 def _normalize_issue_key(raw_key: str) -> str | None:
-    normalized = re.sub(r"[^a-z0-9]+", "_", raw_key.strip().lower()).strip("_")
-    aliases = {
-        "impact": "impact",
-        "status": "status",
-        "owner": "owner",
-        "unblock_condition": "unblock_condition",
-        "unblock": "unblock_condition",
-        "evidence_needed": "evidence_needed",
-        "evidence": "evidence_needed",
-    }
-    return aliases.get(normalized)
+    # Detail keys repeat across issues ("Impact", "Status", ...), so memoize.
+    return _ISSUE_KEY_ALIASES.get(_normalize_key(raw_key))
 
 
 def _parse_issues(active_issue_lines: list[str]) -> list[Issue]:
-    issues: list[Issue] = []
-    issue_head = re.compile(r"^\s*-\s*\[\s*([xX ]?)\s*\]\s*(.+?)\s*$")
-    detail_line = re.compile(r"^\s*-\s*(?P<key>[A-Za-z][A-Za-z _-]*)\s*:\s*(?P<val>.+?)\s*$")
-
-    idx = 0
-    while idx < len(active_issue_lines):
-        line = active_issue_lines[idx]
-        head_match = issue_head.match(line)
-        if not head_match:
-            idx += 1
+    if not _ISSUE_MARKER_RE.search("\n".join(active_issue_lines)):
+        return []
+
+    # (issue id, title, detail fields) in order of appearance.
+    parsed: list[tuple[str, str, dict[str, str]]] = []
+    fields: dict[str, str] | None = None
+
+    for line in active_issue_lines:
+        match = _ISSUE_LINE_RE.match(line)
+        if match is None:
             continue
 
-        head_text = head_match.group(2).strip()
-        parsed_head = re.match(r"(?i)^(ISSUE-[A-Za-z0-9_.-]+)\s*:\s*(.+)$", head_text)
-        if not parsed_head:
-            idx += 1
+        head = match.group("head")
+        if head is not None:
+            # Any checkbox bullet ends the previous issue's details.
+            fields = None
+            parsed_head = _ISSUE_ID_RE.match(head.strip())
+            if parsed_head:
+                fields = {}
+                parsed.append((parsed_head.group(1).upper(), parsed_head.group(2).strip(), fields))
             continue
 
-        issue_id = parsed_head.group(1).upper()
-        title = parsed_head.group(2).strip()
-
-        fields: dict[str, str] = {}
-        scan = idx + 1
-        while scan < len(active_issue_lines):
-            candidate = active_issue_lines[scan]
-            if issue_head.match(candidate):
-                break
-            detail_match = detail_line.match(candidate)
-            if detail_match:
-                key = _normalize_issue_key(detail_match.group("key"))
-                if key and key not in fields:
-                    fields[key] = detail_match.group("val").strip()
-            scan += 1
-
-        issues.append(
-            Issue(
-                issue_id=issue_id,
-                title=title,
-                impact=fields.get("impact"),
-                status=fields.get("status"),
-                owner=fields.get("owner"),
-                unblock_condition=fields.get("unblock_condition"),
-                evidence_needed=fields.get("evidence_needed"),
-            )
+        if fields is not None:
+            key = _normalize_issue_key(match.group("key"))
+            if key and key not in fields:
+                fields[key] = match.group("val").strip()
+
+    return [
+        Issue(
+            issue_id=issue_id,
+            title=title,
+            impact=issue_fields.get("impact"),
+            status=issue_fields.get("status"),
+            owner=issue_fields.get("owner"),
+            unblock_condition=issue_fields.get("unblock_condition"),
+            evidence_needed=issue_fields.get("evidence_needed"),
         )
-        idx = scan
-
-    return issues
+        for issue_id, title, issue_fields in parsed
+    ]
 
 
 def _parse_state(path: Path) -> StateSummary:
@@ -180,10 +216,10 @@ def _parse_state(path: Path) -> StateSummary:
     focus_lines = sections.get("Current focus", [])
     kv: dict[str, str] = {}
     for line in focus_lines:
-        match = re.match(r"^\s*-\s*([^:]+):\s*(.+?)\s*$", line)
+        match = _FOCUS_KV_RE.match(line)
         if not match:
             continue
-        key = re.sub(r"[^a-z0-9]+", "_", match.group(1).strip().lower()).strip("_")
+        key = _normalize_key(match.group(1))
         value = match.group(2).split("<!--", 1)[0].strip()
         kv[key] = value
 
@@ -200,83 +236,97 @@ def _parse_state(path: Path) -> StateSummary:
     )
 
 
-def _extract_checkpoint_sections(plan_text: str) -> list[tuple[str, str, int, int, str | None]]:
-    lines = plan_text.splitlines()
-    sections: list[tuple[str, str, int, int, str | None]] = []
-    current_stage: str | None = None
-    stage_re = re.compile(r"^(#{2,6})\s+(?:\(\s*SKIP\s*\)\s+)?Stage\s+([0-9A-Za-z]+)\s*[—–-]?\s*(.*)$")
-    cp_re = re.compile(
-        r"^(#{3,6})\s+(?:\(\s*(?:DONE|SKIPPED|SKIP)\s*\)\s+)?([0-9A-Za-z]+\.\d+)\s*[—–-]?\s*(.*)$"
-    )
+def _heading_level(line: str) -> int:
+    """Markdown heading level of `line` (1-6), or 0 when it is not a heading."""
+    stripped = line.lstrip("#")
+    level = len(line) - len(stripped)
+    if 0 < level <= 6 and stripped[:1].isspace():
+        return level
+    return 0
 
-    checkpoint_entries: list[tuple[int, int, str, str, str | None]] = []
 
-    for idx, raw in enumerate(lines, start=1):
-        stage_match = stage_re.match(raw)
-        if stage_match:
-            current_stage = stage_match.group(2)
-            continue
+def _iter_lines(path: Path) -> Iterator[str]:
+    """
+    Yield the lines of `path` one at a time, split exactly as str.splitlines()
+    would split the whole file.
+    """
+    with path.open(encoding="utf-8", errors="replace") as handle:
+        for physical in handle:
+            yield from physical.splitlines()
 
-        cp_match = cp_re.match(raw)
-        if cp_match:
-            level = len(cp_match.group(1))
-            cp_id = cp_match.group(2)
-            title = cp_match.group(3).strip()
-            checkpoint_entries.append((idx, level, cp_id, title, current_stage))
-
-    for start_line, level, cp_id, title, stage_id in checkpoint_entries:
-        end_line = len(lines)
-        for candidate_idx in range(start_line, len(lines)):
-            raw = lines[candidate_idx]
-            heading = re.match(r"^(#{1,6})\s+", raw)
-            if heading and len(heading.group(1)) <= level:
-                end_line = candidate_idx
-                break
-        sections.append((cp_id, title, start_line, end_line, stage_id))
 
-    return sections
+def _ordered_fields(seen: set[str]) -> list[str]:
+    """Required fields whose group names (f0, f1, ...) are in `seen`, in declaration order."""
+    return [field for idx, field in enumerate(REQUIRED_CHECKPOINT_FIELDS) if f"f{idx}" in seen]
 
 
-def _find_fields(section_text: str) -> list[str]:
-    found: list[str] = []
-    for field in REQUIRED_CHECKPOINT_FIELDS:
-        pattern = re.compile(
-            rf"(?im)^\s*(?:[-*]\s*)?(?:\*\*)?\s*{re.escape(field)}\s*:?(?:\*\*)?\s*$"
-        )
-        if pattern.search(section_text):
-            found.append(field)
-    return found
+def _scan_plan(lines: Iterable[str]) -> tuple[list[StageSummary], list[CheckpointSummary]]:
+    """
+    Collect stages and checkpoints in one pass over PLAN lines.
 
+    A checkpoint section runs from its heading up to (not including) the next
+    heading of the same or a higher level, or to the end of the file. Each body
+    line is checked for a required field once and credited to every section
+    still open, so no section text is buffered.
+    """
+    stages: list[StageSummary] = []
+    checkpoints: list[CheckpointSummary] = []
+    current_stage: str | None = None
+    # Checkpoints still collecting fields, as (level, summary, field groups
+    # seen); levels strictly increase towards the top of the stack.
+    open_sections: list[tuple[int, CheckpointSummary, set[str]]] = []
 
-def _parse_plan(path: Path) -> PlanSummary:
-    text = _read_text(path)
-    lines = text.splitlines()
+    def close_section() -> None:
+        _, checkpoint, seen = open_sections.pop()
+        checkpoint.fields_present.extend(_ordered_fields(seen))
 
-    stages: list[StageSummary] = []
-    stage_re = re.compile(r"^(#{2,6})\s+(?:\(\s*SKIP\s*\)\s+)?Stage\s+([0-9A-Za-z]+)\s*[—–-]?\s*(.*)$")
     for idx, raw in enumerate(lines, start=1):
-        match = stage_re.match(raw)
-        if not match:
+        level = _heading_level(raw) if raw.startswith("#") else 0
+        if not level:
+            # Headings can never be field lines, so only body lines are checked.
+            if open_sections:
+                field_match = _CHECKPOINT_FIELD_LINE_RE.match(raw)
+                if field_match:
+                    for _, _, seen in open_sections:
+                        seen.add(field_match.lastgroup)
             continue
-        stage_id = match.group(2)
-        stage_title = match.group(3).strip()
-        stages.append(StageSummary(stage_id=stage_id, title=stage_title, line=idx, checkpoint_ids=[]))
 
-    checkpoint_sections = _extract_checkpoint_sections(text)
-    checkpoints: list[CheckpointSummary] = []
+        while open_sections and open_sections[-1][0] >= level:
+            close_section()
+
+        stage_match = _STAGE_HEADING_RE.match(raw)
+        if stage_match:
+            current_stage = stage_match.group(2)
+            stages.append(
+                StageSummary(
+                    stage_id=current_stage,
+                    title=stage_match.group(3).strip(),
+                    line=idx,
+                    checkpoint_ids=[],
+                )
+            )
+            continue
 
-    for cp_id, cp_title, start, end, stage_id in checkpoint_sections:
-        section_text = "\n".join(lines[start - 1 : end])
-        fields = _find_fields(section_text)
-        checkpoints.append(
-            CheckpointSummary(
-                checkpoint_id=cp_id,
-                title=cp_title,
-                stage=stage_id,
-                line=start,
-                fields_present=fields,
+        cp_match = _CHECKPOINT_HEADING_RE.match(raw)
+        if cp_match:
+            checkpoint = CheckpointSummary(
+                checkpoint_id=cp_match.group(2),
+                title=cp_match.group(3).strip(),
+                stage=current_stage,
+                line=idx,
+                fields_present=[],
             )
-        )
+            checkpoints.append(checkpoint)
+            open_sections.append((len(cp_match.group(1)), checkpoint, set()))
+
+    while open_sections:
+        close_section()
+
+    return stages, checkpoints
+
+
+def _parse_plan(path: Path) -> PlanSummary:
+    stages, checkpoints = _scan_plan(_iter_lines(path))
 
     stage_index = {stage.stage_id: stage for stage in stages}
     for checkpoint in checkpoints:
@@ -315,24 +365,21 @@ def _validate_state_format(state: StateSummary, errors: list[str], warnings: lis
             "STATE missing '- Status: NOT_STARTED|IN_PROGRESS|IN_REVIEW|BLOCKED|DONE' under 'Current focus'."
         )
     elif state.status not in ALLOWED_STATUS:
-        allowed = ", ".join(sorted(ALLOWED_STATUS))
-        errors.append(f"STATE Status '{state.status}' is invalid. Allowed: {allowed}.")
+        errors.append(f"STATE Status '{state.status}' is invalid. Allowed: {_ALLOWED_STATUS_TEXT}.")
 
     for issue in state.issues:
         if issue.impact is None:
             errors.append(f"{issue.issue_id}: missing required issue field 'Impact'.")
         elif issue.impact.upper() not in ALLOWED_ISSUE_IMPACT:
-            allowed_impact = ", ".join(sorted(ALLOWED_ISSUE_IMPACT))
             errors.append(
-                f"{issue.issue_id}: Impact '{issue.impact}' is invalid. Allowed: {allowed_impact}."
+                f"{issue.issue_id}: Impact '{issue.impact}' is invalid. Allowed: {_ALLOWED_ISSUE_IMPACT_TEXT}."
             )
 
         if issue.status is None:
             errors.append(f"{issue.issue_id}: missing required issue field 'Status'.")
         elif issue.status.upper() not in ALLOWED_ISSUE_STATUS:
-            allowed_issue_status = ", ".join(sorted(ALLOWED_ISSUE_STATUS))
             errors.append(
-                f"{issue.issue_id}: Status '{issue.status}' is invalid. Allowed: {allowed_issue_status}."
+                f"{issue.issue_id}: Status '{issue.status}' is invalid. Allowed: {_ALLOWED_ISSUE_STATUS_TEXT}."
             )
 
         if not issue.owner:
@@ -348,13 +395,26 @@ def _validate_state_format(state: StateSummary, errors: list[str], warnings: lis
         )
 
 
-def _validate_plan_format(plan: PlanSummary, errors: list[str], _warnings: list[str]) -> None:
+def _plan_keys(plan: PlanSummary) -> tuple[list[str], list[str]]:
+    """Upper-cased stage and checkpoint ids, aligned with plan.stages / plan.checkpoints."""
+    return (
+        [stage.stage_id.upper() for stage in plan.stages],
+        [checkpoint.checkpoint_id.upper() for checkpoint in plan.checkpoints],
+    )
+
+
+def _validate_plan_format(
+    plan: PlanSummary,
+    plan_keys: tuple[list[str], list[str]],
+    errors: list[str],
+    _warnings: list[str],
+) -> None:
+    stage_keys, checkpoint_keys = plan_keys
     if not plan.stages:
         errors.append("PLAN has no stage headings. Expected '## Stage <id> - <name>'.")
 
     stage_ids_seen: set[str] = set()
-    for stage in plan.stages:
-        normalized = stage.stage_id.upper()
+    for stage, normalized in zip(plan.stages, stage_keys):
         if not _STAGE_RE.match(stage.stage_id):
             errors.append(
                 f"PLAN line {stage.line}: Stage id '{stage.stage_id}' is invalid."
@@ -369,7 +429,7 @@ def _validate_plan_format(plan: PlanSummary, errors: list[str], _warnings: list[
         errors.append("PLAN has no checkpoint headings. Expected '### <stage>.<n> - <name>'.")
 
     checkpoint_ids_seen: set[str] = set()
-    for checkpoint in plan.checkpoints:
+    for checkpoint, normalized_cp in zip(plan.checkpoints, checkpoint_keys):
         cp_match = _CHECKPOINT_RE.match(checkpoint.checkpoint_id)
         if cp_match is None:
             errors.append(
@@ -383,29 +443,37 @@ def _validate_plan_format(plan: PlanSummary, errors: list[str], _warnings: list[
                 f"PLAN line {checkpoint.line}: checkpoint '{checkpoint.checkpoint_id}' sits under Stage '{checkpoint.stage}'."
             )
 
-        normalized_cp = checkpoint.checkpoint_id.upper()
         if normalized_cp in checkpoint_ids_seen:
             errors.append(
                 f"PLAN line {checkpoint.line}: duplicate checkpoint id '{checkpoint.checkpoint_id}'."
             )
         checkpoint_ids_seen.add(normalized_cp)
 
-        missing_fields = [field for field in REQUIRED_CHECKPOINT_FIELDS if field not in checkpoint.fields_present]
-        if missing_fields:
-            joined = ", ".join(missing_fields)
+        # fields_present holds each required field at most once, so a full
+        # list means nothing is missing.
+        if len(checkpoint.fields_present) < len(REQUIRED_CHECKPOINT_FIELDS):
+            present = frozenset(checkpoint.fields_present)
+            joined = ", ".join(field for field in REQUIRED_CHECKPOINT_FIELDS if field not in present)
             errors.append(
                 f"PLAN line {checkpoint.line}: checkpoint '{checkpoint.checkpoint_id}' missing field(s): {joined}."
             )
 
 
-def _validate_cross_file(state: StateSummary, plan: PlanSummary, errors: list[str]) -> None:
+def _validate_cross_file(
+    state: StateSummary,
+    plan: PlanSummary,
+    plan_keys: tuple[list[str], list[str]],
+    errors: list[str],
+) -> None:
     if state.stage is None or state.checkpoint is None:
         return
 
-    stage_ids = {stage.stage_id.upper() for stage in plan.stages}
-    checkpoint_ids = {checkpoint.checkpoint_id.upper(): checkpoint for checkpoint in plan.checkpoints}
+    stage_keys, checkpoint_keys = plan_keys
+    stage_ids = set(stage_keys)
+    checkpoint_ids = dict(zip(checkpoint_keys, plan.checkpoints))
+    state_stage_key = state.stage.upper()
 
-    if state.stage.upper() not in stage_ids:
+    if state_stage_key not in stage_ids:
         errors.append(f"STATE Stage '{state.stage}' is not present in PLAN.")
 
     state_checkpoint_key = state.checkpoint.upper()
@@ -415,19 +483,24 @@ def _validate_cross_file(state: StateSummary, plan: PlanSummary, errors: list[st
 
     plan_checkpoint = checkpoint_ids[state_checkpoint_key]
     cp_match = _CHECKPOINT_RE.match(state.checkpoint)
-    if cp_match and cp_match.group(1).upper() != state.stage.upper():
+    if cp_match and cp_match.group(1).upper() != state_stage_key:
         errors.append(
             f"STATE says Stage '{state.stage}', but Checkpoint '{state.checkpoint}' belongs to Stage '{cp_match.group(1)}'."
         )
 
-    if plan_checkpoint.stage and plan_checkpoint.stage.upper() != state.stage.upper():
+    if plan_checkpoint.stage and plan_checkpoint.stage.upper() != state_stage_key:
         errors.append(
             f"PLAN places Checkpoint '{state.checkpoint}' under Stage '{plan_checkpoint.stage}', "
             f"but STATE says Stage '{state.stage}'."
         )
 
 
-def run_troubleshoot(vibe_dir: Path) -> TroubleshootResult:
+def run_troubleshoot(vibe_dir: Path, *, fast_fail: bool = False) -> TroubleshootResult:
+    """
+    Validate STATE.md and PLAN.md under `vibe_dir`.
+
+    With `fast_fail`, PLAN.md is not parsed once STATE.md has produced errors.
+    """
     errors: list[str] = []
     warnings: list[str] = []
 
@@ -436,6 +509,7 @@ def run_troubleshoot(vibe_dir: Path) -> TroubleshootResult:
 
     state_summary: StateSummary | None = None
     plan_summary: PlanSummary | None = None
+    plan_keys: tuple[list[str], list[str]] = ([], [])
 
     if not state_path.exists():
         errors.append(f"Missing required file: {state_path}")
@@ -443,14 +517,18 @@ def run_troubleshoot(vibe_dir: Path) -> TroubleshootResult:
         state_summary = _parse_state(state_path)
         _validate_state_format(state_summary, errors, warnings)
 
+    if fast_fail and errors:
+        return TroubleshootResult(ok=False, errors=errors, warnings=warnings, state=state_summary, plan=None)
+
     if not plan_path.exists():
         errors.append(f"Missing required file: {plan_path}")
     else:
         plan_summary = _parse_plan(plan_path)
-        _validate_plan_format(plan_summary, errors, warnings)
+        plan_keys = _plan_keys(plan_summary)
+        _validate_plan_format(plan_summary, plan_keys, errors, warnings)
 
     if state_summary is not None and plan_summary is not None:
-        _validate_cross_file(state_summary, plan_summary, errors)
+        _validate_cross_file(state_summary, plan_summary, plan_keys, errors)
 
     return TroubleshootResult(
         ok=not errors,
@@ -510,14 +588,16 @@ def _render_text(result: TroubleshootResult) -> str:
     return "\n".join(lines)
 
 
-def _to_json_payload(result: TroubleshootResult) -> dict[str, object]:
-    return {
-        "ok": result.ok,
-        "errors": result.errors,
-        "warnings": result.warnings,
-        "state": asdict(result.state) if result.state else None,
-        "plan": asdict(result.plan) if result.plan else None,
-    }
+def _json_default(obj: object) -> dict[str, object]:
+    """
+    json.dumps hook for the summary dataclasses.
+
+    Returns a shallow field dict; json calls back here for nested dataclasses,
+    so nothing is deep-copied the way dataclasses.asdict() would.
+    """
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {field.name: getattr(obj, field.name) for field in fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -528,12 +608,17 @@ def main(argv: list[str] | None = None) -> int:
         help="Directory containing STATE.md and PLAN.md (default: .vibe)",
     )
     parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON output")
+    parser.add_argument(
+        "--fast-fail",
+        action="store_true",
+        help="Skip PLAN.md checks when STATE.md already has errors",
+    )
     args = parser.parse_args(argv)
 
-    result = run_troubleshoot(Path(args.vibe_dir).resolve())
+    result = run_troubleshoot(Path(args.vibe_dir).resolve(), fast_fail=args.fast_fail)
 
     if args.json:
-        print(json.dumps(_to_json_payload(result), indent=2, sort_keys=True))
+        print(json.dumps(result, default=_json_default, indent=2, sort_keys=True))
     else:
         print(_render_text(result))
 
@@ -4,35 +4,49 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import hashlib
 import json
+import os
 import shutil
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, TextIO
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 TOOLS_RLM_DIR = REPO_ROOT / "tools" / "rlm"
 if str(TOOLS_RLM_DIR) not in sys.path:
     sys.path.insert(0, str(TOOLS_RLM_DIR))
 
-from context_bundle import _build_bundle, _read_task  # type: ignore
 from runtime import RLMRuntime, RuntimeErrorState  # type: ignore
 
 EXECUTOR_STATE_FILE = "executor_state.json"
+EXECUTOR_JOURNAL_FILE = "executor_journal.jsonl"
 RUNTIME_STATE_FILE = "state.json"
 CACHE_MODES = {"readwrite", "readonly", "off"}
 SUPPORTED_MODES = {"baseline", "subcalls"}
 DEFAULT_RETRY_ATTEMPTS = 3
+# Full executor_state.json snapshots are written every this many steps (and on
+# stop); steps in between are appended to the journal.
+SNAPSHOT_EVERY = 16
+JOURNAL_FIELDS = ("cursor", "final_artifact", "status", "stop_reason", "subcalls_total")
 
 
 def _utc_now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _stat_signature(path: Path) -> dict[str, int]:
+    st = path.stat()
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
 def _sha256_file(path: Path) -> str:
-    return hashlib.sha256(path.read_bytes()).hexdigest()
+    if not hasattr(hashlib, "file_digest"):  # Python < 3.11
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    with path.open("rb") as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
 
 
 def _sha256_text(text: str) -> str:
@@ -98,29 +112,46 @@ def _cache_path_for_task(task_id: str, repo_root: Path) -> Path:
     return repo_root / ".vibe" / "rlm" / "cache" / f"{task_id}.jsonl"
 
 
+# Parsed cache indexes by cache path, with the byte offset parsed up to. A run
+# builds a fresh subcall handler every step; this keeps it from re-reading and
+# re-parsing the whole cache file each time.
+_CACHE_INDEXES: dict[Path, tuple[dict[str, dict[str, Any]], int]] = {}
+
+
 def _load_cache_index(path: Path) -> dict[str, dict[str, Any]]:
-    index: dict[str, dict[str, Any]] = {}
-    if not path.exists():
-        return index
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            stripped = line.strip()
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        _CACHE_INDEXES.pop(path, None)
+        return {}
+
+    index, offset = _CACHE_INDEXES.get(path, ({}, 0))
+    if size < offset:
+        # Truncated or replaced since the last load; start over.
+        index, offset = {}, 0
+    with path.open("rb") as handle:
+        handle.seek(offset)
+        for raw in handle:
+            offset += len(raw)
+            stripped = raw.strip()
             if not stripped:
                 continue
-            payload = json.loads(stripped)
+            payload = json.loads(stripped.decode("utf-8"))
             if not isinstance(payload, dict):
                 continue
             request_hash = str(payload.get("request_hash", "")).strip()
             if not request_hash:
                 continue
             index.setdefault(request_hash, payload)
+    _CACHE_INDEXES[path] = (index, offset)
     return index
 
 
 def _append_cache_entry(path: Path, payload: dict[str, Any]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
+    # Cache entries are built with their keys in sorted order already.
     with path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(payload, sort_keys=True) + "\n")
+        handle.write(json.dumps(payload) + "\n")
 
 
 def _normalize_provider_name(value: Any) -> str:
@@ -178,12 +209,21 @@ def _provider_policy_details(provider_policy: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+@functools.lru_cache(maxsize=256)
+def _request_hash(prompt: str, provider: str) -> str:
+    """Hash of the canonical ``{"prompt", "provider"}`` request payload.
+
+    Memoized because one subcall hashes the same pair for the cache probe,
+    the live query and the mock response, and resumed runs replay prompts.
+    The canonical form is spelled out directly; it is byte-for-byte what
+    ``_stable_json`` produces for this two-key object.
+    """
+    canonical = f'{{"prompt":{json.dumps(prompt)},"provider":{json.dumps(provider)}}}'
+    return hashlib.sha256(canonical.encode("ascii")).hexdigest()
+
+
 def _mock_provider_response(provider: str, prompt: str) -> str:
-    request_material = {
-        "prompt": prompt,
-        "provider": provider,
-    }
-    digest = _sha256_text(_stable_json(request_material))
+    digest = _request_hash(prompt, provider)
     return f"{provider}:{digest[:24]}"
 
 
@@ -221,7 +261,7 @@ def _query_with_deterministic_retry(provider: str, prompt: str) -> tuple[str, in
 def _build_llm_query_handler(
     task: dict[str, Any],
     state: dict[str, Any],
-    trace_path: Path,
+    trace: TextIO,
     repo_root: Path,
     runtime: RLMRuntime,
 ) -> Callable[..., dict[str, Any]]:
@@ -229,8 +269,9 @@ def _build_llm_query_handler(
     if not isinstance(provider_policy, dict):
         raise RuntimeError("Task provider_policy must be an object.")
     policy = _provider_policy_details(provider_policy)
-    allowed_providers = set(policy["allowed"])
-    provider_order = list(policy["candidate_order"])
+    allowed_providers = frozenset(policy["allowed"])
+    allowed_raw = ", ".join(policy["allowed"])
+    provider_order = tuple(policy["candidate_order"])
     cache_mode = str(state.get("cache_mode", "off")).strip().lower()
     if cache_mode not in CACHE_MODES:
         raise RuntimeError(f"Invalid cache mode '{cache_mode}'.")
@@ -248,13 +289,12 @@ def _build_llm_query_handler(
         requested_provider = _normalize_provider_name(provider) if provider is not None else ""
         if requested_provider:
             if requested_provider not in allowed_providers:
-                allowed_raw = ", ".join(policy["allowed"])
                 raise RuntimeErrorState(
                     f"Requested provider '{requested_provider}' is not allowed; allowed=[{allowed_raw}]"
                 )
-            provider_candidates = [requested_provider]
+            provider_candidates: tuple[str, ...] = (requested_provider,)
         else:
-            provider_candidates = list(provider_order)
+            provider_candidates = provider_order
 
         max_subcalls_per_iter = int(state.get("max_subcalls_per_iter", 0))
         max_subcalls_total = int(state.get("max_subcalls_total", 0))
@@ -281,16 +321,12 @@ def _build_llm_query_handler(
         attempts = 0
 
         for candidate in provider_candidates:
-            candidate_payload = {
-                "prompt": prompt_text,
-                "provider": candidate,
-            }
-            candidate_hash = _sha256_text(_stable_json(candidate_payload))
+            candidate_hash = _request_hash(prompt_text, candidate)
             cached = cache_index.get(candidate_hash)
             if cached is None:
                 continue
             provider_name = candidate
-            request_payload = candidate_payload
+            request_payload = {"prompt": prompt_text, "provider": candidate}
             request_hash = candidate_hash
             response_text = str(cached.get("response_text", ""))
             response_hash = str(cached.get("response_hash", "")) or _sha256_text(response_text)
@@ -300,23 +336,18 @@ def _build_llm_query_handler(
         if cache_status != "hit" and cache_mode == "readonly":
             raise RuntimeErrorState(
                 "Readonly cache miss for provider candidates "
-                f"{provider_candidates} and prompt hash seed "
+                f"{list(provider_candidates)} and prompt hash seed "
                 f"{_sha256_text(prompt_text)} in {cache_path}"
             )
 
         if cache_status != "hit":
             provider_failures: list[str] = []
             for candidate in provider_candidates:
-                candidate_payload = {
-                    "prompt": prompt_text,
-                    "provider": candidate,
-                }
-                candidate_hash = _sha256_text(_stable_json(candidate_payload))
                 try:
                     response_text, attempts = _query_with_deterministic_retry(candidate, prompt_text)
                     provider_name = candidate
-                    request_payload = candidate_payload
-                    request_hash = candidate_hash
+                    request_payload = {"prompt": prompt_text, "provider": candidate}
+                    request_hash = _request_hash(prompt_text, candidate)
                     break
                 except RuntimeErrorState as exc:
                     provider_failures.append(f"{candidate}: {exc}")
@@ -350,7 +381,7 @@ def _build_llm_query_handler(
         response_hashes.append(response_hash)
 
         _append_trace(
-            trace_path,
+            trace,
             {
                 "attempts": attempts,
                 "cache_mode": cache_mode,
@@ -371,7 +402,8 @@ def _build_llm_query_handler(
             "attempts": attempts,
             "cache": cache_status,
             "provider": provider_name,
-            "provider_candidates": provider_candidates,
+            # A fresh list for the program, which may keep or mutate it.
+            "provider_candidates": list(provider_candidates),
             "request_hash": request_hash,
             "response_hash": response_hash,
             "text": response_text,
@@ -380,16 +412,27 @@ def _build_llm_query_handler(
     return llm_query
 
 
-def _load_task(task_path: Path) -> dict[str, Any]:
+def _load_task(task_path: Path) -> tuple[dict[str, Any], list[str]]:
+    """Load and validate a task, returning it with its normalized program.
+
+    The task file is pinned by sha256 for the life of a run, so the program
+    is validated here once and handed to every step.
+    """
+    # context_bundle (and validate_task behind it) is only needed once a
+    # command actually loads a task, not for --help or usage errors.
+    from context_bundle import _read_task  # type: ignore
+
     task = _read_task(task_path)
     if task is None:
         raise RuntimeError("Task validation failed.")
     mode = _normalize_mode(task)
-    _validate_program(task, mode)
-    return task
+    program = _validate_program(task, mode)
+    return task, program
 
 
 def _bundle_dir_for_task(task: dict[str, Any], repo_root: Path) -> Path:
+    from context_bundle import _build_bundle  # type: ignore
+
     output_root = repo_root / ".vibe" / "rlm" / "bundles"
     _build_bundle(task, repo_root, output_root)
     task_id = str(task.get("task_id"))
@@ -409,6 +452,10 @@ def _write_json(path: Path, payload: dict[str, Any]) -> None:
     path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
 
 
+def _journal_path(run_dir: Path) -> Path:
+    return run_dir / EXECUTOR_JOURNAL_FILE
+
+
 def _load_executor_state(run_dir: Path) -> dict[str, Any]:
     path = _state_path(run_dir)
     if not path.exists():
@@ -416,11 +463,93 @@ def _load_executor_state(run_dir: Path) -> dict[str, Any]:
     payload = json.loads(path.read_text(encoding="utf-8"))
     if not isinstance(payload, dict):
         raise RuntimeError(f"Executor state must be an object: {path}")
+    if _replay_journal(run_dir, payload):
+        # Fold the journal into a fresh snapshot before anything appends to it,
+        # so a torn line is dropped now instead of hiding later entries.
+        _save_executor_state(run_dir, payload)
     return payload
 
 
 def _save_executor_state(run_dir: Path, state: dict[str, Any]) -> None:
-    _write_json(_state_path(run_dir), state)
+    # Write beside the snapshot and rename over it, so an interrupted save
+    # leaves the previous snapshot (plus journal) rather than a torn file.
+    path = _state_path(run_dir)
+    tmp_path = path.with_name(path.name + ".tmp")
+    _write_json(tmp_path, state)
+    os.replace(tmp_path, path)
+    # The snapshot now covers everything the journal recorded.
+    _safe_remove_file(_journal_path(run_dir))
+
+
+def _journal_step(run_dir: Path, state: dict[str, Any], *, response_hashes_from: int) -> None:
+    """Append the fields a step can change to the journal.
+
+    Every entry carries absolute values (response hashes as a tail starting at
+    a fixed index), so replaying the journal over the snapshot it was written
+    against, or over a newer one, gives the same state.
+    """
+    entry = {field: state.get(field) for field in JOURNAL_FIELDS if field in state}
+    response_hashes = state.get("response_hashes")
+    if isinstance(response_hashes, list):
+        entry["response_hashes_from"] = response_hashes_from
+        entry["response_hashes"] = response_hashes[response_hashes_from:]
+    with _journal_path(run_dir).open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+
+def _replay_journal(run_dir: Path, state: dict[str, Any]) -> bool:
+    """Apply journal entries to ``state``; returns whether a journal was found."""
+    path = _journal_path(run_dir)
+    if not path.exists():
+        return False
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            stripped = line.strip()
+            if not stripped:
+                continue
+            try:
+                entry = json.loads(stripped)
+            except json.JSONDecodeError:
+                # A torn final line from an interrupted write; earlier entries stand.
+                break
+            if not isinstance(entry, dict):
+                continue
+            for field in JOURNAL_FIELDS:
+                if field in entry:
+                    state[field] = entry[field]
+            added = entry.get("response_hashes")
+            if isinstance(added, list):
+                hashes = state.get("response_hashes")
+                if not isinstance(hashes, list):
+                    hashes = []
+                    state["response_hashes"] = hashes
+                del hashes[int(entry.get("response_hashes_from", len(hashes))):]
+                hashes.extend(added)
+    return True
+
+
+def _run_until_stop(
+    task: dict[str, Any],
+    program: list[str],
+    state: dict[str, Any],
+    runtime: RLMRuntime,
+    trace: TextIO,
+    repo_root: Path,
+    run_dir: Path,
+) -> None:
+    """Step until the run stops, journaling each step and snapshotting periodically."""
+    steps = 0
+    while True:
+        response_hashes = state.get("response_hashes")
+        hashes_before = len(response_hashes) if isinstance(response_hashes, list) else 0
+        running = _step_once(task, program, state, runtime, trace, repo_root)
+        _journal_step(run_dir, state, response_hashes_from=hashes_before)
+        steps += 1
+        if not running:
+            break
+        if steps % SNAPSHOT_EVERY == 0:
+            _save_executor_state(run_dir, state)
+    _save_executor_state(run_dir, state)
 
 
 def _safe_remove_file(path: Path) -> None:
@@ -439,6 +568,7 @@ def _prepare_new_run_artifacts(
     repo_root: Path,
 ) -> None:
     _safe_remove_file(run_dir / RUNTIME_STATE_FILE)
+    _safe_remove_file(_journal_path(run_dir))
     _safe_remove_file(trace_path)
 
     outputs = task.get("outputs")
@@ -456,10 +586,16 @@ def _prepare_new_run_artifacts(
                 _safe_remove_file(_resolve_path(raw, repo_root))
 
 
-def _append_trace(trace_path: Path, payload: dict[str, Any]) -> None:
+def _open_trace(trace_path: Path) -> TextIO:
+    """Open the trace for appending; callers keep it open for the whole run."""
     trace_path.parent.mkdir(parents=True, exist_ok=True)
-    with trace_path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(payload, sort_keys=True) + "\n")
+    return trace_path.open("a", encoding="utf-8", buffering=1 << 16)
+
+
+def _append_trace(trace: TextIO, payload: dict[str, Any]) -> None:
+    # Trace payloads are built with their keys already in sorted order, so
+    # the records match what sort_keys=True would write.
+    trace.write(json.dumps(payload) + "\n")
 
 
 def _finalize_artifacts(task: dict[str, Any], final_payload: Any, repo_root: Path) -> str:
@@ -513,6 +649,7 @@ def _init_executor_state(
         "task_id": task_id,
         "task_path": str(task_path),
         "task_sha256": _sha256_file(task_path),
+        "task_stat": _stat_signature(task_path),
         "trace_path": str(trace_path),
     }
 
@@ -529,19 +666,24 @@ def _validate_resume_state(
     state: dict[str, Any],
     run_dir: Path,
     repo_root: Path,
-) -> tuple[dict[str, Any], Path, Path]:
+) -> tuple[dict[str, Any], list[str], Path, Path]:
     task_path = Path(str(state.get("task_path", ""))).resolve()
     if not task_path.exists():
         raise RuntimeError(f"Task path in executor state no longer exists: {task_path}")
 
-    recorded_sha = str(state.get("task_sha256", "")).strip()
-    current_sha = _sha256_file(task_path)
-    if recorded_sha != current_sha:
-        raise RuntimeError(
-            "Task content changed since executor state was created; resume would be ambiguous."
-        )
+    # An unchanged (mtime, size) means the recorded hash still holds; only
+    # re-hash the task when the file was touched.
+    current_stat = _stat_signature(task_path)
+    if state.get("task_stat") != current_stat:
+        recorded_sha = str(state.get("task_sha256", "")).strip()
+        current_sha = _sha256_file(task_path)
+        if recorded_sha != current_sha:
+            raise RuntimeError(
+                "Task content changed since executor state was created; resume would be ambiguous."
+            )
+        state["task_stat"] = current_stat
 
-    task = _load_task(task_path)
+    task, program = _load_task(task_path)
     mode = _normalize_mode(task)
     recorded_mode = str(state.get("mode", "")).strip().lower()
     if recorded_mode and recorded_mode != mode:
@@ -554,20 +696,20 @@ def _validate_resume_state(
         bundle_dir = _bundle_dir_for_task(task, repo_root)
 
     trace_path = Path(str(state.get("trace_path", run_dir / "trace.jsonl"))).resolve()
-    return task, bundle_dir, trace_path
+    return task, program, bundle_dir, trace_path
 
 
 def _record_step(
     runtime_result: dict[str, Any],
-    code: str,
+    code_sha256: str,
     cursor: int,
-    trace_path: Path,
+    trace: TextIO,
     *,
     subcalls_this_iter: int,
     subcalls_total: int,
 ) -> None:
     payload = {
-        "code_sha256": hashlib.sha256(code.encode("utf-8")).hexdigest(),
+        "code_sha256": code_sha256,
         "error": runtime_result.get("error"),
         "event": "iteration",
         "finalized": bool(runtime_result.get("finalized")),
@@ -579,10 +721,10 @@ def _record_step(
         "subcalls_this_iter": subcalls_this_iter,
         "subcalls_total": subcalls_total,
     }
-    _append_trace(trace_path, payload)
+    _append_trace(trace, payload)
 
 
-def _record_stop(state: dict[str, Any], runtime: RLMRuntime, trace_path: Path) -> None:
+def _record_stop(state: dict[str, Any], runtime: RLMRuntime, trace: TextIO) -> None:
     payload = {
         "event": "stop",
         "finalized": runtime.finalized,
@@ -591,14 +733,16 @@ def _record_stop(state: dict[str, Any], runtime: RLMRuntime, trace_path: Path) -
         "status": state.get("status"),
         "stop_reason": state.get("stop_reason"),
     }
-    _append_trace(trace_path, payload)
+    _append_trace(trace, payload)
+    trace.flush()
 
 
 def _step_once(
     task: dict[str, Any],
+    program: list[str],
     state: dict[str, Any],
     runtime: RLMRuntime,
-    trace_path: Path,
+    trace: TextIO,
     repo_root: Path,
 ) -> bool:
     if state.get("status") != "RUNNING":
@@ -608,20 +752,21 @@ def _step_once(
     if runtime.iteration >= max_root_iters:
         state["status"] = "LIMIT_REACHED"
         state["stop_reason"] = "MAX_ROOT_ITERS"
-        _record_stop(state, runtime, trace_path)
+        _record_stop(state, runtime, trace)
         return False
 
-    mode = _normalize_mode(task)
-    program = _validate_program(task, mode)
+    # The mode was normalized into state at init and checked against the task
+    # on resume.
+    mode = str(state.get("mode") or "") or _normalize_mode(task)
     cursor = int(state.get("cursor", 0))
     if cursor >= len(program):
         state["status"] = "LIMIT_REACHED"
         state["stop_reason"] = "PROGRAM_EXHAUSTED"
-        _record_stop(state, runtime, trace_path)
+        _record_stop(state, runtime, trace)
         return False
 
     if mode == "subcalls":
-        runtime.llm_query_handler = _build_llm_query_handler(task, state, trace_path, repo_root, runtime)
+        runtime.llm_query_handler = _build_llm_query_handler(task, state, trace, repo_root, runtime)
     else:
         runtime.llm_query_handler = None
 
@@ -630,11 +775,13 @@ def _step_once(
     result = runtime.step(code)
     subcalls_after = int(state.get("subcalls_total", 0))
 
+    # The runtime already hashed this code for its own event log.
+    code_sha256 = str(runtime.events[-1]["code_sha256"]) if runtime.events else _sha256_text(code)
     _record_step(
         result,
-        code,
+        code_sha256,
         cursor,
-        trace_path,
+        trace,
         subcalls_this_iter=max(0, subcalls_after - subcalls_before),
         subcalls_total=subcalls_after,
     )
@@ -644,20 +791,20 @@ def _step_once(
     if result.get("error"):
         state["status"] = "BLOCKED"
         state["stop_reason"] = "STEP_ERROR"
-        _record_stop(state, runtime, trace_path)
+        _record_stop(state, runtime, trace)
         return False
 
     if bool(result.get("finalized")):
         state["status"] = "COMPLETED"
         state["stop_reason"] = "FINAL"
         state["final_artifact"] = _finalize_artifacts(task, result.get("final_payload"), repo_root)
-        _record_stop(state, runtime, trace_path)
+        _record_stop(state, runtime, trace)
         return False
 
     if runtime.iteration >= max_root_iters:
         state["status"] = "LIMIT_REACHED"
         state["stop_reason"] = "MAX_ROOT_ITERS"
-        _record_stop(state, runtime, trace_path)
+        _record_stop(state, runtime, trace)
         return False
 
     return True
@@ -700,7 +847,7 @@ def _assert_cache_override_matches_state(requested: str | None, state: dict[str,
 def cmd_run(args: argparse.Namespace) -> int:
     repo_root = REPO_ROOT
     task_path = _resolve_path(args.task, repo_root).resolve()
-    task = _load_task(task_path)
+    task, program = _load_task(task_path)
     mode = _normalize_mode(task)
 
     requested_cache = _normalize_cache_mode(args.cache, mode=mode)
@@ -723,10 +870,8 @@ def cmd_run(args: argparse.Namespace) -> int:
         max_stdout_chars=int(state["max_stdout_chars"]),
     )
 
-    while _step_once(task, state, runtime, trace_path, repo_root):
-        _save_executor_state(run_dir, state)
-
-    _save_executor_state(run_dir, state)
+    with _open_trace(trace_path) as trace:
+        _run_until_stop(task, program, state, runtime, trace, repo_root, run_dir)
     print(json.dumps(_summary(run_dir, state, runtime), indent=2, sort_keys=True))
     return 0 if state.get("status") in {"COMPLETED", "LIMIT_REACHED"} else 1
 
@@ -736,7 +881,7 @@ def cmd_step(args: argparse.Namespace) -> int:
     run_dir = _resolve_path(args.run_dir, repo_root).resolve()
     state = _load_executor_state(run_dir)
     _assert_cache_override_matches_state(args.cache, state)
-    task, bundle_dir, trace_path = _validate_resume_state(state, run_dir, repo_root)
+    task, program, bundle_dir, trace_path = _validate_resume_state(state, run_dir, repo_root)
 
     runtime = RLMRuntime(
         bundle_dir=bundle_dir,
@@ -744,7 +889,8 @@ def cmd_step(args: argparse.Namespace) -> int:
         max_stdout_chars=int(state["max_stdout_chars"]),
     )
 
-    _step_once(task, state, runtime, trace_path, repo_root)
+    with _open_trace(trace_path) as trace:
+        _step_once(task, program, state, runtime, trace, repo_root)
     _save_executor_state(run_dir, state)
     print(json.dumps(_summary(run_dir, state, runtime), indent=2, sort_keys=True))
     return 0 if state.get("status") in {"RUNNING", "COMPLETED", "LIMIT_REACHED"} else 1
@@ -755,7 +901,7 @@ def cmd_resume(args: argparse.Namespace) -> int:
     run_dir = _resolve_path(args.run_dir, repo_root).resolve()
     state = _load_executor_state(run_dir)
     _assert_cache_override_matches_state(args.cache, state)
-    task, bundle_dir, trace_path = _validate_resume_state(state, run_dir, repo_root)
+    task, program, bundle_dir, trace_path = _validate_resume_state(state, run_dir, repo_root)
 
     runtime = RLMRuntime(
         bundle_dir=bundle_dir,
@@ -763,10 +909,8 @@ def cmd_resume(args: argparse.Namespace) -> int:
         max_stdout_chars=int(state["max_stdout_chars"]),
     )
 
-    while _step_once(task, state, runtime, trace_path, repo_root):
-        _save_executor_state(run_dir, state)
-
-    _save_executor_state(run_dir, state)
+    with _open_trace(trace_path) as trace:
+        _run_until_stop(task, program, state, runtime, trace, repo_root, run_dir)
     print(json.dumps(_summary(run_dir, state, runtime), indent=2, sort_keys=True))
     return 0 if state.get("status") in {"COMPLETED", "LIMIT_REACHED"} else 1
 
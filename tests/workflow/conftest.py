@@ -11,6 +11,12 @@ if str(_tools_dir) not in sys.path:
     sys.path.insert(0, str(_tools_dir))
 
 
+@pytest.fixture(autouse=True)
+def _isolated_cache_home(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep parsed-catalog caches out of the real user cache directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("cache")))
+
+
 @pytest.fixture
 def temp_repo(tmp_path: Path) -> Generator[Path, None, None]:
     """Create a temporary repo with .vibe directory structure."""
@@ -14,6 +14,7 @@ from agentctl import (  # type: ignore
     _recommend_next,
     _validate_checkpoint_dag,
     build_parser,
+    run_next,
     validate,
 )
 
@@ -373,3 +374,32 @@ def test_cmd_next_parallel_one_matches_default_shape(temp_repo: Path, capsys) ->
     assert len(parallel_payload["recommended_roles"]) == 1
     assert default_payload["recommended_roles"][0]["checkpoint"] == "1.1"
     assert parallel_payload["recommended_roles"][0]["checkpoint"] == "1.1"
+
+
+def test_run_next_returns_same_payload_as_cli(temp_repo: Path, capsys) -> None:
+    _write_state(temp_repo, stage="1", checkpoint="1.0", status="DONE")
+    _write_plan(
+        temp_repo,
+        """# PLAN
+
+## Stage 1 — Demo
+
+### (DONE) 1.0 — Foundation
+
+### 1.1 — Ready A
+  depends_on: [1.0]
+
+### 1.2 — Ready B
+  depends_on: [1.0]
+""",
+    )
+
+    cli_exit, cli_payload = _run_json_command(
+        capsys,
+        ["--repo-root", str(temp_repo), "--format", "json", "next", "--parallel", "2"],
+    )
+    lib_exit, lib_payload = run_next(temp_repo, parallel=2)
+
+    assert capsys.readouterr().out == ""
+    assert lib_exit == cli_exit == 0
+    assert lib_payload == cli_payload
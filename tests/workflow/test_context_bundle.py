@@ -0,0 +1,51 @@
+"""Tests for RLM context bundle source resolution."""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+_rlm_dir = Path(__file__).resolve().parents[2] / "tools" / "rlm"
+if str(_rlm_dir) not in sys.path:
+    sys.path.insert(0, str(_rlm_dir))
+
+from context_bundle import _resolve_source_files  # noqa: E402
+
+
+def _task(*sources: dict) -> dict:
+    return {"context_sources": list(sources)}
+
+
+@pytest.fixture
+def layout(tmp_path: Path) -> Path:
+    repo_root = tmp_path / "repo"
+    (repo_root / "sub").mkdir(parents=True)
+    (repo_root / "docs").mkdir()
+    (repo_root / "docs" / "a.txt").write_text("a\n", encoding="utf-8")
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "s.txt").write_text("secret\n", encoding="utf-8")
+    return repo_root
+
+
+def test_file_and_dir_sources_resolve_relative_to_repo_root(layout: Path) -> None:
+    files = _resolve_source_files(
+        _task({"type": "file", "path": "docs/a.txt"}, {"type": "dir", "path": "docs"}),
+        layout,
+    )
+    assert [f.rel_path for f in files] == ["docs/a.txt"]
+
+
+def test_file_source_with_parent_segments_outside_repo_is_rejected(layout: Path) -> None:
+    with pytest.raises(ValueError):
+        _resolve_source_files(_task({"type": "file", "path": "sub/../../outside/s.txt"}), layout)
+
+
+def test_file_source_under_symlinked_directory_outside_repo_is_rejected(layout: Path) -> None:
+    try:
+        (layout / "link").symlink_to(layout.parent / "outside", target_is_directory=True)
+    except (OSError, NotImplementedError):
+        pytest.skip("symlinks not supported")
+    with pytest.raises(ValueError):
+        _resolve_source_files(_task({"type": "file", "path": "link/s.txt"}), layout)
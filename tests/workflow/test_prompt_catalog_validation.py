@@ -1,6 +1,7 @@
 """Tests for prompt catalog location validation."""
 from __future__ import annotations
 
+import os
 import sys
 from pathlib import Path
 
@@ -9,7 +10,13 @@ import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tools"))
 
-from prompt_catalog import load_catalog  # type: ignore
+from prompt_catalog import (  # type: ignore
+    build_catalog_index,
+    find_entry,
+    load_catalog,
+    load_catalog_index,
+    load_catalog_iter,
+)
 
 
 def _write_catalog(path: Path) -> None:
@@ -44,3 +51,71 @@ def test_rejects_duplicate_prompt_catalogs(tmp_path: Path) -> None:
 
     with pytest.raises(ValueError, match="Multiple prompt catalogs detected"):
         load_catalog(canonical)
+
+
+def test_streamed_lookup_stops_at_matching_key(tmp_path: Path) -> None:
+    catalog = tmp_path / "template_prompts.md"
+    catalog.write_text(
+        "## prompt.one - One\n"
+        "```md\n"
+        "hello\n"
+        "```\n"
+        "\n"
+        "## prompt.two - Two\n"
+        "```md\n"
+        "never closed\n",
+        encoding="utf-8",
+    )
+
+    entry = find_entry(load_catalog_iter(catalog), "prompt.one")
+
+    assert entry is not None
+    assert entry.body == "hello"
+    with pytest.raises(ValueError, match="Unterminated fenced block"):
+        load_catalog(catalog)
+
+
+def test_catalog_index_lookup_matches_list_lookup(tmp_path: Path) -> None:
+    catalog = tmp_path / "template_prompts.md"
+    catalog.write_text(
+        "## prompt.one - One\n"
+        "```md\n"
+        "first\n"
+        "```\n"
+        "\n"
+        "## Second Prompt\n"
+        "```md\n"
+        "second\n"
+        "```\n",
+        encoding="utf-8",
+    )
+    entries = load_catalog(catalog)
+    index = build_catalog_index(entries)
+
+    for query in ("prompt.one", "one", "second prompt", "second_prompt", "missing"):
+        assert find_entry(index, query) == find_entry(entries, query)
+    assert find_entry(index, "SECOND PROMPT").body == "second"
+
+
+def test_load_catalog_index_is_reused_until_catalog_changes(tmp_path: Path) -> None:
+    catalog = tmp_path / "template_prompts.md"
+    catalog.write_text("## prompt.one - One\n```md\nfirst\n```\n", encoding="utf-8")
+
+    index = load_catalog_index(catalog)
+    assert load_catalog_index(catalog) is index
+    assert find_entry(index, "prompt.one").body == "first"
+
+    catalog.write_text("## prompt.one - One\n```md\nfirst, edited\n```\n", encoding="utf-8")
+    assert find_entry(load_catalog_index(catalog), "prompt.one").body == "first, edited"
+
+
+def test_load_catalog_rewrites_one_sidecar_per_catalog(tmp_path: Path) -> None:
+    catalog = tmp_path / "template_prompts.md"
+    for n, body in enumerate(("first", "second", "third, longer")):
+        catalog.write_text(f"## prompt.one - One\n```md\n{body}\n```\n", encoding="utf-8")
+        os.utime(catalog, ns=(n * 10**9, n * 10**9))
+        assert find_entry(load_catalog(catalog), "prompt.one").body == body
+        assert find_entry(load_catalog(catalog), "prompt.one").body == body
+
+    sidecars = list((Path(os.environ["XDG_CACHE_HOME"]) / "vibe-prompts").glob("*.pkl"))
+    assert len(sidecars) == 1
@@ -0,0 +1,96 @@
+"""Tests for the vibe-loop vibe_next_and_print helper."""
+from __future__ import annotations
+
+import importlib.util
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+_SCRIPT = _REPO_ROOT / ".codex" / "skills" / "vibe-loop" / "scripts" / "vibe_next_and_print.py"
+
+
+def _load_script():
+    spec = importlib.util.spec_from_file_location("_test_vibe_next_and_print", _SCRIPT)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "print('shim ran')\n# def run_next(repo_root):\n",
+        "print('shim ran')\nclass Tool:\n    def run_next(self, repo_root):\n        return 0, {}\n",
+        "print('shim ran')\nraise SystemExit(0)\n",
+    ],
+)
+def test_load_tool_module_never_runs_scripts_without_top_level_entry_point(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], source: str
+) -> None:
+    script = _load_script()
+    shim = tmp_path / "agentctl.py"
+    shim.write_text(source, encoding="utf-8")
+
+    assert script._load_tool_module(shim, "run_next") is None
+    assert "shim ran" not in capsys.readouterr().out
+
+
+def test_load_tool_module_imports_tool_with_entry_point(tmp_path: Path) -> None:
+    script = _load_script()
+    tool = tmp_path / "agentctl.py"
+    tool.write_text("def run_next(repo_root):\n    return 0, {'stage': '1'}\n", encoding="utf-8")
+
+    module = script._load_tool_module(tool, "run_next")
+    assert module is not None
+    assert module.run_next(tmp_path) == (0, {"stage": "1"})
+    assert script._load_tool_module(tool, "find_entry") is None
+
+
+def _run_script(repo_root: Path, *extra: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, str(_SCRIPT), "--repo-root", str(repo_root), "--show-decision", *extra],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+    )
+
+
+def test_isolate_prints_same_decision_and_prompt_as_in_process(
+    temp_repo: Path, vibe_state: Path, vibe_plan: Path
+) -> None:
+    ignore = shutil.ignore_patterns("__pycache__")
+    shutil.copytree(_REPO_ROOT / "tools", temp_repo / "tools", ignore=ignore)
+    shutil.copytree(_REPO_ROOT / "prompts", temp_repo / "prompts", ignore=ignore)
+
+    in_process = _run_script(temp_repo)
+    isolated = _run_script(temp_repo, "--isolate")
+
+    assert in_process.returncode == 0, in_process.stderr
+    assert '"recommended_prompt_id"' in in_process.stderr
+    assert in_process.stdout.strip()
+    assert (isolated.returncode, isolated.stdout, isolated.stderr) == (
+        in_process.returncode,
+        in_process.stdout,
+        in_process.stderr,
+    )
+
+
+def test_locate_skills_root_follows_codex_home_changes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    script = _load_script()
+    homes = []
+    for name in ("home_a", "home_b"):
+        home = tmp_path / name
+        for skill in ("vibe-loop", "vibe-prompts"):
+            (home / "skills" / skill).mkdir(parents=True)
+        homes.append(home)
+
+    monkeypatch.delenv("AGENT_HOME", raising=False)
+    for home in homes:
+        monkeypatch.setenv("CODEX_HOME", str(home))
+        assert script._locate_skills_root() == (home / "skills").resolve()
@@ -326,6 +326,68 @@ def test_vibe_run_executor_records_loop_result(tmp_path: Path) -> None:
     assert recorded.read_text(encoding="utf-8").startswith("LOOP_RESULT:")
 
 
+def test_vibe_run_executor_runs_shell_syntax_through_shell(tmp_path: Path) -> None:
+    repo_root = tmp_path / "repo"
+    _setup_fake_repo(
+        repo_root,
+        executor_body=(
+            "#!/usr/bin/env python3\n"
+            "print('LOOP_RESULT: {\"loop\":\"implement\",\"result\":\"pass\",\"stage\":\"1\",\"checkpoint\":\"1.0\","
+            "\"status\":\"NOT_STARTED\",\"next_role_hint\":\"implement\"}')\n"
+        ),
+    )
+
+    runner = Path(__file__).resolve().parents[2] / ".codex" / "skills" / "vibe-run" / "scripts" / "vibe_run.py"
+    proc = subprocess.run(
+        [
+            sys.executable,
+            str(runner),
+            "--repo-root",
+            str(repo_root),
+            "--executor",
+            f"echo \"role=$VIBE_RECOMMENDED_ROLE\" && {sys.executable} {repo_root / 'executor.py'}",
+            "--max-loops",
+            "10",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    assert proc.returncode == 0
+    assert "role=implement" in proc.stdout
+    assert (repo_root / ".vibe" / "recorded_loop_result.txt").exists()
+
+
+def test_vibe_run_executor_without_shebang_falls_back_to_shell(tmp_path: Path) -> None:
+    repo_root = tmp_path / "repo"
+    _setup_fake_repo(
+        repo_root,
+        executor_body=(
+            "echo 'LOOP_RESULT: {\"loop\":\"implement\",\"result\":\"pass\",\"stage\":\"1\",\"checkpoint\":\"1.0\","
+            "\"status\":\"NOT_STARTED\",\"next_role_hint\":\"implement\"}'\n"
+        ),
+    )
+
+    runner = Path(__file__).resolve().parents[2] / ".codex" / "skills" / "vibe-run" / "scripts" / "vibe_run.py"
+    proc = subprocess.run(
+        [
+            sys.executable,
+            str(runner),
+            "--repo-root",
+            str(repo_root),
+            "--executor",
+            "./executor.py",
+            "--max-loops",
+            "10",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert (repo_root / ".vibe" / "recorded_loop_result.txt").exists()
+
+
 def test_vibe_run_falls_back_to_repo_canonical_catalog(tmp_path: Path) -> None:
     repo_root = tmp_path / "repo"
     _setup_fake_repo_catalog_fallback(
@@ -505,3 +567,100 @@ def test_vibe_run_minor_threshold_can_accept_approval(tmp_path: Path) -> None:
     approval_flag = repo_root / ".vibe" / "approved.txt"
     assert approval_flag.exists()
     assert "recorded approval for workflow continuous-refactor: 1" in proc.stderr
+
+
+def _setup_fake_repo_importable_tools(repo_root: Path) -> None:
+    (repo_root / ".vibe").mkdir(parents=True)
+    (repo_root / "tools").mkdir(parents=True)
+    _write_prompt_catalog(_repo_catalog_path(repo_root))
+
+    _write_executable(
+        repo_root / "tools" / "agentctl.py",
+        """#!/usr/bin/env python3
+import json
+import os
+import sys
+from pathlib import Path
+
+
+def run_next(repo_root, workflow=None):
+    vibe = Path(repo_root) / ".vibe"
+    with (vibe / "next_pids.txt").open("a", encoding="utf-8") as fh:
+        fh.write(f"{os.getpid()}\\n")
+    count_path = vibe / "next_count.txt"
+    count = int(count_path.read_text(encoding="utf-8")) if count_path.exists() else 0
+    count_path.write_text(str(count + 1), encoding="utf-8")
+    if count == 0:
+        return 0, {
+            "recommended_role": "implement",
+            "recommended_prompt_id": "prompt.checkpoint_implementation",
+            "stage": "1",
+            "checkpoint": "1.0",
+            "status": "NOT_STARTED",
+        }
+    return 0, {"recommended_role": "stop", "recommended_prompt_id": "stop"}
+
+
+def main(argv=None):
+    args = list(argv if argv is not None else sys.argv[1:])
+    repo_root = Path(args[args.index("--repo-root") + 1])
+    if "loop-result" in args:
+        line = args[args.index("--line") + 1]
+        (repo_root / ".vibe" / "recorded_loop_result.txt").write_text(line, encoding="utf-8")
+        (repo_root / ".vibe" / "loop_result_pid.txt").write_text(str(os.getpid()), encoding="utf-8")
+        print(json.dumps({"ok": True}))
+        return 0
+    return 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+""",
+    )
+
+    _write_executable(
+        repo_root / "tools" / "prompt_catalog.py",
+        """#!/usr/bin/env python3
+from collections import namedtuple
+
+Entry = namedtuple("Entry", "key body")
+
+
+def load_catalog(path):
+    return [Entry("prompt.checkpoint_implementation", "IN-PROCESS PROMPT BODY")]
+
+
+def find_entry(entries, key):
+    return next((e for e in entries if e.key == key), None)
+""",
+    )
+
+
+def test_vibe_run_calls_importable_tools_in_process(tmp_path: Path) -> None:
+    repo_root = tmp_path / "repo"
+    _setup_fake_repo_importable_tools(repo_root)
+
+    runner = Path(__file__).resolve().parents[2] / ".codex" / "skills" / "vibe-run" / "scripts" / "vibe_run.py"
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            str(runner),
+            "--repo-root",
+            str(repo_root),
+            "--non-interactive",
+            "--simulate-loop-result",
+            "--max-loops",
+            "10",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    stdout, stderr = proc.communicate()
+
+    assert proc.returncode == 0, stderr
+    assert "IN-PROCESS PROMPT BODY" in stdout
+    vibe = repo_root / ".vibe"
+    assert (vibe / "next_pids.txt").read_text(encoding="utf-8").split() == [str(proc.pid)] * 2
+    assert (vibe / "loop_result_pid.txt").read_text(encoding="utf-8") == str(proc.pid)
+    assert (vibe / "recorded_loop_result.txt").read_text(encoding="utf-8").startswith("LOOP_RESULT:")
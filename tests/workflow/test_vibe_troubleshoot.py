@@ -157,3 +157,25 @@ def test_troubleshoot_reports_state_plan_mismatch(temp_repo: Path) -> None:
     assert result.ok is False
     assert any("STATE Stage '2' is not present in PLAN." in err for err in result.errors)
     assert any("STATE Checkpoint '2.0' is not present in PLAN." in err for err in result.errors)
+
+
+def test_troubleshoot_fast_fail_skips_plan_when_state_is_invalid(temp_repo: Path) -> None:
+    _write(temp_repo / ".vibe" / "STATE.md", "# STATE\n")
+    _write(
+        temp_repo / ".vibe" / "PLAN.md",
+        """# PLAN
+
+### 1.0 - Orphan checkpoint
+""",
+    )
+
+    troubleshoot = _load_troubleshoot_module()
+    full = troubleshoot.run_troubleshoot(temp_repo / ".vibe")
+    fast = troubleshoot.run_troubleshoot(temp_repo / ".vibe", fast_fail=True)
+
+    assert full.plan is not None
+    assert any(err.startswith("PLAN ") for err in full.errors)
+    assert fast.ok is False
+    assert fast.plan is None
+    assert fast.errors
+    assert not any(err.startswith("PLAN ") for err in fast.errors)
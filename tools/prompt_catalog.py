@@ -17,31 +17,50 @@ This module is intended to be used by:
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import os
+import pickle
 import re
 import sys
+import tempfile
 import unicodedata
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 
-_HEADER_RE = re.compile(r"^##\s+(?P<hdr>.+?)\s*$")
 _STABLE_ID_RE = re.compile(r"^(?P<id>[a-z0-9_.-]+)\s+[—–-]\s+(?P<title>.+)$") # Accept em dash (—), en dash (–), or hyphen (-) as the separator.
 _ZERO_WIDTH = dict.fromkeys(map(ord, "\ufeff\u200b\u200c\u200d"), None)
-_BAD_4BT_RE = re.compile(r"^\s*`{4,}\s*$")          # line is only 4+ backticks
-_FENCE_START_RE = re.compile(r"^\s*```(?P<lang>[A-Za-z0-9_-]+)?\s*$")
-_FENCE_END_RE = re.compile(r"^\s*```\s*$")
+_ID_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789_.-")
+# Deletes every ASCII char outside the stable-id alphabet; non-ASCII keys take the regex path.
+_ID_STRIP_TABLE = str.maketrans("", "", "".join(chr(c) for c in range(128) if chr(c) not in _ID_CHARS))
+_NON_ID_RE = re.compile(r"[^a-z0-9_.-]")
+_FENCE_LANG_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_-"
+# parse_catalog states.
+_SEEK_HEADER, _SEEK_FENCE, _IN_BODY = range(3)
 
 
 
 
 @dataclass(frozen=True)
 class CatalogEntry:
+    # Hand-written rather than slots=True so the module still loads on Python < 3.10.
+    __slots__ = ("key", "title", "body", "start_line")
+
     key: str          # stable id if present, else derived from title
     title: str        # human title
     body: str         # fenced block content (without fences)
     start_line: int   # 1-based line number where header appears
 
+    # Frozen + slots: pickle/copy must bypass the frozen __setattr__.
+    def __getstate__(self) -> Tuple[str, str, str, int]:
+        return (self.key, self.title, self.body, self.start_line)
+
+    def __setstate__(self, state: Tuple[str, str, str, int]) -> None:
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
 
 def _derive_key_from_title(title: str) -> str:
     # Conservative slug; stable IDs are preferred.
@@ -50,101 +69,256 @@ def _derive_key_from_title(title: str) -> str:
     return slug or "untitled"
 
 
+def _classify_line(line: str) -> Optional[Tuple[str, str]]:
+    """
+    Return ("header", text), ("fence", lang) or ("bad", "") for structural lines, else None.
+
+    String-method equivalent of ^##\\s+(.+?)\\s*$, ^\\s*```([A-Za-z0-9_-]+)?\\s*$ and
+    ^\\s*`{4,}\\s*$; str.strip() removes exactly the whitespace \\s matches.
+    A closing fence is a fence with an empty lang.
+    """
+    if line.startswith("##"):
+        rest = line[2:]
+        if len(rest) >= 2 and rest[0].isspace():
+            return ("header", rest.strip())
+        return None
+    stripped = line.strip()
+    if not stripped.startswith("```"):
+        return None
+    lang = stripped[3:]
+    if not lang.strip(_FENCE_LANG_CHARS):
+        return ("fence", lang)
+    if not lang.strip("`"):
+        return ("bad", "")
+    return None
+
+
 def parse_catalog(text: str) -> List[CatalogEntry]:
-    lines = text.splitlines()
-    entries: List[CatalogEntry] = []
-
-    i = 0
-    while i < len(lines):
-        m = _HEADER_RE.match(lines[i])
-        if not m:
-            i += 1
-            continue
+    return list(parse_catalog_iter(text.splitlines()))
 
-        hdr = _normalize_header(m.group("hdr").strip())
-        stable = _STABLE_ID_RE.match(hdr)
-        if stable:
-            raw_key = _normalize_header(stable.group("id").strip())
-            # Defensive: remove any leftover non-ascii key junk
-            key = re.sub(r"[^a-z0-9_.-]", "", raw_key)
-            title = _normalize_header(stable.group("title").strip())
 
-        else:
-            title = hdr
-            key = _derive_key_from_title(title)
+def parse_catalog_iter(lines: Iterable[str]) -> Iterator[CatalogEntry]:
+    """
+    Yield entries as each fenced block closes.
+
+    `lines` must already be split (no line terminators). Errors, including
+    duplicate keys, are raised when the offending line is reached.
+    """
+    seen: Dict[str, CatalogEntry] = {}
 
-        header_line_no = i + 1
+    state = _SEEK_HEADER
+    key = title = ""
+    header_line_no = 0
+    body_lines: List[str] = []
 
-        # Find first fenced code block after header.
-        j = i + 1
-        
-        while j < len(lines) and not _FENCE_START_RE.match(lines[j]):
-            if _BAD_4BT_RE.match(lines[j]):
+    for lineno, line in enumerate(lines, 1):
+        # Headers start with "##" and fences with "```" after leading whitespace;
+        # prose (including inline code spans) is never classified.
+        if line.startswith("##") or line.lstrip().startswith("```"):
+            cls = _classify_line(line)
+        else:
+            cls = None
+        if cls is None:
+            if state == _IN_BODY:
+                body_lines.append(line)
+            continue
+        kind, value = cls
+
+        if state == _IN_BODY:
+            if kind == "fence" and not value:
+                prev = seen.get(key)
+                if prev is not None:
+                    raise ValueError(
+                        f"Duplicate catalog key '{key}': line {prev.start_line} and line {header_line_no}. "
+                        f"Use stable IDs to disambiguate."
+                    )
+                body = "\n".join(body_lines).rstrip("\n")
+                entry = CatalogEntry(key=key, title=title, body=body, start_line=header_line_no)
+                seen[key] = entry
+                yield entry
+                state = _SEEK_HEADER
+            elif kind == "bad":
                 raise ValueError(
-                    f"Invalid fence: found 4+ backticks at line {j+1}. "
+                    f"Invalid fence: found 4+ backticks at line {lineno}. "
                     f"Use triple backticks only."
                 )
-            if _HEADER_RE.match(lines[j]):
-                break
-            j += 1
-
-
-        if j >= len(lines) or not _FENCE_START_RE.match(lines[j]):
-            # No payload found; skip this header.
-            i += 1
+            else:
+                body_lines.append(line)
             continue
 
-        # Capture until closing fence.
-        j += 1
-        body_lines: List[str] = []
-
-        while j < len(lines) and not _FENCE_END_RE.match(lines[j]):
-            if _BAD_4BT_RE.match(lines[j]):
+        if kind == "header":
+            hdr = _normalize_header(value)
+            stable = _STABLE_ID_RE.match(hdr)
+            if stable:
+                raw_key = _normalize_header(stable.group("id").strip())
+                # Defensive: remove any leftover non-ascii key junk
+                if raw_key.isascii():
+                    key = raw_key.translate(_ID_STRIP_TABLE)
+                else:
+                    key = _NON_ID_RE.sub("", raw_key)
+                title = _normalize_header(stable.group("title").strip())
+
+            else:
+                title = hdr
+                key = _derive_key_from_title(title)
+
+            header_line_no = lineno
+            # Payload is the first fenced code block after the header; a later
+            # header without a fence in between supersedes this one.
+            state = _SEEK_FENCE
+        elif state == _SEEK_FENCE:
+            if kind == "fence":
+                body_lines = []
+                state = _IN_BODY
+            elif kind == "bad":
                 raise ValueError(
-                    f"Invalid fence: found 4+ backticks at line {j+1}. "
+                    f"Invalid fence: found 4+ backticks at line {lineno}. "
                     f"Use triple backticks only."
                 )
-            body_lines.append(lines[j])
-            j += 1
 
-        if j >= len(lines):
-            raise ValueError(f"Unterminated fenced block after header at line {header_line_no}")
+    if state == _IN_BODY:
+        raise ValueError(f"Unterminated fenced block after header at line {header_line_no}")
 
-        body = "\n".join(body_lines).rstrip("\n")
-        entries.append(CatalogEntry(key=key, title=title, body=body, start_line=header_line_no))
 
-        i = j + 1  # continue after closing fence
+def _iter_file_lines(f) -> Iterator[str]:
+    # str.splitlines() per physical line matches splitting the whole text: it
+    # honours the same terminators (\x0c, \u2028, ...) and drops them.
+    for raw in f:
+        yield from raw.splitlines()
 
-    # Enforce unique keys.
-    seen: Dict[str, CatalogEntry] = {}
-    for e in entries:
-        if e.key in seen:
-            prev = seen[e.key]
-            raise ValueError(
-                f"Duplicate catalog key '{e.key}': line {prev.start_line} and line {e.start_line}. "
-                f"Use stable IDs to disambiguate."
-            )
-        seen[e.key] = e
 
+_CACHE_FORMAT_VERSION = 1
+
+
+def _catalog_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME")
+    return (Path(base) if base else Path.home() / ".cache") / "vibe-prompts"
+
+
+def _catalog_cache_path(path: Path) -> Path:
+    # One sidecar per catalog path, overwritten whenever the catalog changes.
+    raw = str(path.absolute()).encode("utf-8")
+    return _catalog_cache_dir() / f"{hashlib.blake2b(raw, digest_size=16).hexdigest()}.pkl"
+
+
+def _catalog_stamp(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (_CACHE_FORMAT_VERSION, st.st_mtime_ns, st.st_size)
+
+
+def _read_catalog_cache(cache_path: Path, stamp: Tuple[int, int, int]) -> Optional[List[CatalogEntry]]:
+    try:
+        with cache_path.open("rb") as f:
+            cached_stamp, rows = pickle.load(f)
+        if tuple(cached_stamp) != stamp:
+            return None
+        return [CatalogEntry(key=k, title=t, body=b, start_line=n) for k, t, b, n in rows]
+    except (OSError, EOFError, pickle.UnpicklingError, TypeError, ValueError):
+        return None
+
+
+def _write_catalog_cache(cache_path: Path, stamp: Tuple[int, int, int], entries: List[CatalogEntry]) -> None:
+    # Plain tuples keep the sidecar independent of how this module was imported.
+    rows = [(e.key, e.title, e.body, e.start_line) for e in entries]
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((stamp, rows), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, cache_path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except OSError:
+        pass
+
+
+def load_catalog(path: Path, *, use_cache: bool = True) -> List[CatalogEntry]:
+    """
+    Parse a catalog file, reusing a pickled per-path sidecar while the
+    catalog's mtime and size are unchanged.
+    """
+    _validate_catalog_path(path)
+    stamp = _catalog_stamp(path) if use_cache else None
+    cache_path = _catalog_cache_path(path) if stamp is not None else None
+    if cache_path is not None:
+        cached = _read_catalog_cache(cache_path, stamp)
+        if cached is not None:
+            return cached
+    with path.open(encoding="utf-8", newline="") as f:
+        entries = list(parse_catalog_iter(_iter_file_lines(f)))
+    if cache_path is not None:
+        _write_catalog_cache(cache_path, stamp, entries)
     return entries
 
 
-def load_catalog(path: Path) -> List[CatalogEntry]:
+def load_catalog_iter(path: Path) -> Iterator[CatalogEntry]:
+    """
+    Stream entries from a catalog file without reading it whole or using the cache.
+
+    Stopping early (e.g. via find_entry on a stable key) leaves the rest of the
+    file unread and unvalidated.
+    """
     _validate_catalog_path(path)
-    return parse_catalog(path.read_text(encoding="utf-8"))
+    with path.open(encoding="utf-8", newline="") as f:
+        yield from parse_catalog_iter(_iter_file_lines(f))
+
+
+@dataclass(frozen=True)
+class CatalogIndex:
+    entries: List[CatalogEntry]
+    by_key: Dict[str, CatalogEntry]
+    by_title_lower: Dict[str, CatalogEntry]   # first entry wins per title
+
+
+def build_catalog_index(entries: Iterable[CatalogEntry]) -> CatalogIndex:
+    index = CatalogIndex(entries=[], by_key={}, by_title_lower={})
+    for e in entries:
+        index.entries.append(e)
+        index.by_key[e.key] = e
+        index.by_title_lower.setdefault(e.title.lower(), e)
+    return index
+
 
+_CATALOG_INDEXES: Dict[str, Tuple[Tuple[int, int], CatalogIndex]] = {}
 
-def index_catalog(entries: List[CatalogEntry]) -> Dict[str, CatalogEntry]:
-    return {e.key: e for e in entries}
+
+def load_catalog_index(path: Path) -> CatalogIndex:
+    """
+    Load a catalog as a CatalogIndex, reused in this process until the file changes.
+    """
+    _validate_catalog_path(path)
+    st = path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _CATALOG_INDEXES.get(str(path))
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    index = build_catalog_index(load_catalog(path))
+    _CATALOG_INDEXES[str(path)] = (stamp, index)
+    return index
 
 
 def _normalize_header(s: str) -> str:
     # Normalize Unicode and strip common invisible chars that break keys.
+    # ASCII text is already NFKC and cannot contain the zero-width chars.
+    if s.isascii():
+        return s
     s = unicodedata.normalize("NFKC", s)
     s = s.translate(_ZERO_WIDTH)
     return s
 
 
+@functools.lru_cache(maxsize=16)
+def _catalog_siblings(parent: str, mtime_ns: Optional[int]) -> Tuple[str, ...]:
+    # Keyed on the directory mtime, which changes whenever entries are added,
+    # removed or renamed, so repeated loads skip the directory scan.
+    return tuple(p.name for p in sorted(Path(parent).glob("*template_prompts*.md")) if p.is_file())
+
+
 def _validate_catalog_path(catalog_path: Path) -> None:
     """
     Enforce a single canonical prompt catalog under prompts/.
@@ -156,9 +330,13 @@ def _validate_catalog_path(catalog_path: Path) -> None:
             f"Non-canonical prompt catalog path: {catalog_path}. "
             "Use template_prompts.md."
         )
-    matches = sorted(p for p in catalog_path.parent.glob("*template_prompts*.md") if p.is_file())
-    if len(matches) > 1:
-        extras = [p.name for p in matches if p.name != "template_prompts.md"]
+    try:
+        mtime_ns = catalog_path.parent.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    names = _catalog_siblings(str(catalog_path.parent), mtime_ns)
+    if len(names) > 1:
+        extras = [name for name in names if name != "template_prompts.md"]
         extra_list = ", ".join(extras) if extras else "additional catalog(s)"
         raise ValueError(
             f"Multiple prompt catalogs detected in {catalog_path.parent}: {extra_list}. "
@@ -166,29 +344,43 @@ def _validate_catalog_path(catalog_path: Path) -> None:
         )
 
 
-def find_entry(entries: List[CatalogEntry], key_or_title: str) -> Optional[CatalogEntry]:
+def find_entry(
+    entries: Union[CatalogIndex, Iterable[CatalogEntry]], key_or_title: str
+) -> Optional[CatalogEntry]:
     """
     Lookup priority:
     1) exact key match (stable ID)
     2) exact title match (case-insensitive)
     3) derived-key match from title
+
+    A CatalogIndex answers from its dicts. Any other iterable is scanned once;
+    an exact key match stops consuming it immediately.
     """
     q = key_or_title.strip()
     if not q:
         return None
 
-    by_key = index_catalog(entries)
-    if q in by_key:
-        return by_key[q]
-
-    # title case-insensitive
     q_lower = q.lower()
+    derived = _derive_key_from_title(q)
+    if isinstance(entries, CatalogIndex):
+        return (
+            entries.by_key.get(q)
+            or entries.by_title_lower.get(q_lower)
+            or entries.by_key.get(derived)
+        )
+
+    by_title: Optional[CatalogEntry] = None
+    by_derived: Optional[CatalogEntry] = None
     for e in entries:
-        if e.title.lower() == q_lower:
+        if e.key == q:
             return e
+        # title case-insensitive
+        if by_title is None and e.title.lower() == q_lower:
+            by_title = e
+        if e.key == derived:
+            by_derived = e
 
-    derived = _derive_key_from_title(q)
-    return by_key.get(derived)
+    return by_title if by_title is not None else by_derived
 
 
 def list_entries(path: Path) -> List[Tuple[str, str]]:
@@ -208,6 +400,11 @@ def main() -> int:
 
     p = argparse.ArgumentParser(prog="prompt_catalog.py")
     p.add_argument("catalog", type=str, help="Path to template_prompts.md")
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always re-parse the catalog instead of using the parsed-catalog cache.",
+    )
     sub = p.add_subparsers(dest="cmd", required=True)
 
     sp_list = sub.add_parser("list", help="List prompt keys and titles")
@@ -216,15 +413,19 @@ def main() -> int:
 
     args = p.parse_args()
     catalog_path = Path(args.catalog).expanduser().resolve()
-    entries = load_catalog(catalog_path)
 
     if args.cmd == "list":
+        entries = load_catalog(catalog_path, use_cache=not args.no_cache)
         for k, t in [(e.key, e.title) for e in entries]:
             print(f"{k}\t{t}")
         return 0
 
     if args.cmd == "get":
-        e = find_entry(entries, args.name)
+        if args.no_cache:
+            # Uncached lookups stream the file and stop at the matching key.
+            e = find_entry(load_catalog_iter(catalog_path), args.name)
+        else:
+            e = find_entry(load_catalog(catalog_path), args.name)
         if not e:
             print(f"ERROR: prompt not found: {args.name}")
             return 2